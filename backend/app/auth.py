@@ -1,19 +1,44 @@
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+import jwt
+from jwt import PyJWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.cache import TTLCache
 from app.config import settings
 from app.models import User
 from app.schemas import TokenData
 from app.database import get_db
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Password hashing: argon2id for new hashes, bcrypt kept so existing hashes
+# still verify and get upgraded on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+    bcrypt__rounds=12,
+)
+# Verified against when the email is unknown, so every login pays the same hash cost
+_DUMMY_HASH = pwd_context.hash("!" * 32)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Validated tokens -> user id, so repeat requests skip jwt.decode and the email lookup
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 def verify_password(plain_password, hashed_password):
     """
     Verify a plain password against a hashed password
@@ -29,23 +54,37 @@ def get_password_hash(password):
 def authenticate_user(db: Session, email: str, password: str):
     """
     Authenticate a user by email and password
+
+    Sync on purpose: it is called from the sync login route, which FastAPI runs
+    in the threadpool, so the DB lookup and the hash verify stay off the event
+    loop. Legacy bcrypt hashes are rehashed with argon2 after a successful verify.
     """
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        print(f"[AUTH DEBUG] User not found for email: {email}")
-        return False
+    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+    if user is None:
+        verify_password(password, _DUMMY_HASH)
+        password_valid = False
+    else:
+        password_valid = verify_password(password, user.password_hash)
 
-    print(f"[AUTH DEBUG] User found: {user.email}, checking password...")
-    password_valid = verify_password(password, user.password_hash)
-    print(f"[AUTH DEBUG] Password valid: {password_valid}")
+    # One line per attempt; the email is hashed so logs don't leak which accounts exist
+    logger.info(
+        "login_attempt",
+        extra={"email_hash": hashlib.blake2b(email.encode()).hexdigest()[:16], "ok": password_valid},
+    )
 
     if not password_valid:
         return False
+
+    if pwd_context.needs_update(user.password_hash):
+        user.password_hash = get_password_hash(password)
+        db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """
     Create a JWT access token
+
+    Callers pass the user id as "sub" (plus "email" for display/debugging).
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -62,17 +101,32 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+    cache_key = _token_cache_key(token)
+    cached_user_id = _token_cache.get(cache_key)
+    if cached_user_id is not None:
+        user = db.get(User, cached_user_id)
+        if user is not None:
+            return user
+        _token_cache.pop(cache_key)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        sub = payload.get("sub")
+        if sub is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
+        token_data = TokenData(user_id=int(sub), email=payload.get("email"))
+    except (PyJWTError, ValueError):
         raise credentials_exception
-        
-    user = db.query(User).filter(User.email == token_data.email).first()
+
+    # "sub" is the user id, so this is a primary-key get that can be served
+    # from the session's identity map
+    user = db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+
+    # Never cache past the token's own expiry
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    _token_cache.set(cache_key, user.id, ttl=ttl)
+    return user
@@ -1,15 +1,32 @@
 import os
+from functools import lru_cache
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # 加载 .env 文件中的环境变量
 load_dotenv()
 
 class Settings(BaseSettings):
+    # "dev" creates missing tables on startup; anywhere else the schema comes from `alembic upgrade head`
+    ENV: str = os.getenv("ENV", "production")
+
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "your-database-url-please-change-in-production")
+
+    # Connection pool settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+    USE_PGBOUNCER: bool = os.getenv("USE_PGBOUNCER", "false").lower() == "true"  # transaction pooling in front of Postgres
     
+    # Monitoring: built-in /metrics middleware, and per-request cProfile via ?profile=1 (debug only)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+
     # JWT settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-for-jwt-please-change-in-production")
     ALGORITHM: str = "HS256"
@@ -29,6 +46,8 @@ class Settings(BaseSettings):
     # AI API Keys
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY", "")  # Optional - expensive
     GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY", "")  # Recommended - cheap & powerful
+    CHAT_MODEL: str = os.getenv("CHAT_MODEL", "gemini-2.5-flash-lite")  # first try for chat/preference extraction
+    CHAT_FALLBACK_MODEL: str = os.getenv("CHAT_FALLBACK_MODEL", "gemini-2.5-flash")  # used when the first reply fails to parse
 
     # Frontend and deployment settings
     vite_api_base_url: Optional[str] = os.getenv("VITE_API_BASE_URL", "")
@@ -38,8 +57,14 @@ class Settings(BaseSettings):
     rapidapi_key: Optional[str] = os.getenv("RAPIDAPI_KEY", "")
     admin_secret: Optional[str] = os.getenv("ADMIN_SECRET", "")
 
-    class Config:
-        env_file = ".env"
-        extra = "ignore"  # Ignore extra fields from .env
+    # Ignore extra fields from .env; frozen because settings are read-only after startup
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once per process (single .env parse)"""
+    return Settings()
+
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -1,14 +1,47 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
+
+def _engine_kwargs(url: str) -> dict:
+    """
+    Pool settings for the app engine.
+
+    Keeps warm connections around (no TCP/TLS handshake per request), pings them
+    before use so connections Postgres has closed are dropped, and recycles them
+    before idle timeouts kick in. Behind PgBouncer the pooling happens there, so
+    SQLAlchemy keeps no pool of its own. The compiled statement cache is sized
+    above the 500 default so the filter combinations from search don't evict
+    the hot lookups and get recompiled on every request.
+    """
+    if url.startswith("sqlite"):
+        return {}
+
+    kwargs = {
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "pool_pre_ping": True,
+        "connect_args": {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"},
+    }
+    if settings.USE_PGBOUNCER:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return kwargs
+
+
 # Create SQLAlchemy engine instance
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, future=True, **_engine_kwargs(settings.DATABASE_URL))
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
 # Create Base class for models, all the models will inherit this base class
 Base = declarative_base()
@@ -23,4 +56,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -17,6 +17,42 @@ down_revision: Union[str, None] = '59b94fe0c885'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+BACKFILL_BATCH_SIZE = 5000
+
+EXTENDED_SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(extended_description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(address, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(city, '')), 'C')
+"""
+
+BASIC_SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+"""
+
+
+def _backfill_search_vector(expression: str) -> None:
+    """
+    Rebuild search_vector in primary-key batches, committing each one.
+
+    Small transactions keep row locks short, bound WAL per commit and let
+    autovacuum reclaim dead tuples between batches.
+    """
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT max(id) FROM properties")).scalar() or 0
+    update = sa.text(
+        f"UPDATE properties SET search_vector = {expression} WHERE id >= :lo AND id < :hi"
+    )
+
+    # autocommit_block commits the migration transaction so far and runs each
+    # batch in its own transaction
+    with op.get_context().autocommit_block():
+        for lo in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+            conn.execute(update, {"lo": lo, "hi": lo + BACKFILL_BATCH_SIZE})
+            print(f"search_vector backfill: ids < {min(lo + BACKFILL_BATCH_SIZE, max_id + 1)} of {max_id}")
+
 
 def upgrade() -> None:
     """Update properties_search_vector trigger to include extended fields."""
@@ -49,15 +85,7 @@ def upgrade() -> None:
     """)
 
     # Backfill existing rows so new fields are reflected in search_vector
-    op.execute("""
-        UPDATE properties
-        SET search_vector =
-            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
-            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
-            setweight(to_tsvector('english', coalesce(extended_description, '')), 'B') ||
-            setweight(to_tsvector('english', coalesce(address, '')), 'C') ||
-            setweight(to_tsvector('english', coalesce(city, '')), 'C');
-    """)
+    _backfill_search_vector(EXTENDED_SEARCH_VECTOR)
 
 
 def downgrade() -> None:
@@ -85,9 +113,4 @@ def downgrade() -> None:
     """)
 
     # Rebuild vectors using the reduced field set
-    op.execute("""
-        UPDATE properties
-        SET search_vector =
-            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
-            setweight(to_tsvector('english', coalesce(description, '')), 'B');
-    """)
+    _backfill_search_vector(BASIC_SEARCH_VECTOR)
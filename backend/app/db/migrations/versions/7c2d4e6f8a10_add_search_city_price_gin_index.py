@@ -0,0 +1,34 @@
+"""add composite gin index on search_vector, city, price
+
+Revision ID: 7c2d4e6f8a10
+Revises: 38e7ee9e6267
+Create Date: 2026-10-17 09:12:44.310522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d4e6f8a10'
+down_revision: Union[str, None] = '38e7ee9e6267'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a multicolumn GIN index so text + city/price filters use one index scan."""
+    # btree_gin provides GIN operator classes for scalar columns (city, price)
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin;")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_properties_search_city_price
+        ON properties USING gin (search_vector, city, price);
+    """)
+
+
+def downgrade() -> None:
+    """Remove the composite GIN index (the extension is left installed)."""
+    op.execute("DROP INDEX IF EXISTS idx_properties_search_city_price;")
@@ -0,0 +1,47 @@
+"""convert property_embeddings.embedding from jsonb to pgvector
+
+Revision ID: 8d3e5f7a9b21
+Revises: 7c2d4e6f8a10
+Create Date: 2026-10-17 10:03:18.552907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3e5f7a9b21'
+down_revision: Union[str, None] = '7c2d4e6f8a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store 384-dim MiniLM embeddings as vector(384) with an HNSW cosine index."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector;")
+
+    # A JSON array's text form ("[0.1, 0.2, ...]") is a valid vector literal
+    op.execute("ALTER TABLE property_embeddings ADD COLUMN embedding_vec vector(384);")
+    op.execute("UPDATE property_embeddings SET embedding_vec = (embedding::text)::vector;")
+    op.execute("ALTER TABLE property_embeddings DROP COLUMN embedding;")
+    op.execute("ALTER TABLE property_embeddings RENAME COLUMN embedding_vec TO embedding;")
+    op.execute("ALTER TABLE property_embeddings ALTER COLUMN embedding SET NOT NULL;")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_property_embeddings_hnsw
+        ON property_embeddings USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64);
+    """)
+
+
+def downgrade() -> None:
+    """Convert embeddings back to JSONB."""
+    op.execute("DROP INDEX IF EXISTS idx_property_embeddings_hnsw;")
+
+    op.execute("ALTER TABLE property_embeddings ADD COLUMN embedding_json jsonb;")
+    op.execute("UPDATE property_embeddings SET embedding_json = (embedding::text)::jsonb;")
+    op.execute("ALTER TABLE property_embeddings DROP COLUMN embedding;")
+    op.execute("ALTER TABLE property_embeddings RENAME COLUMN embedding_json TO embedding;")
+    op.execute("ALTER TABLE property_embeddings ALTER COLUMN embedding SET NOT NULL;")
@@ -0,0 +1,35 @@
+"""create search_vector gin index concurrently
+
+Revision ID: 9e4f6a8b0c32
+Revises: 8d3e5f7a9b21
+Create Date: 2026-10-17 10:41:07.128834
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f6a8b0c32'
+down_revision: Union[str, None] = '8d3e5f7a9b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Build the BM25 GIN index without blocking writes to properties."""
+    # CONCURRENTLY can't run inside a transaction; IF NOT EXISTS keeps this a
+    # no-op on databases that got the index from e1a2b3c4d5e6 before the split
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_search_vector
+            ON properties USING gin(search_vector);
+        """)
+
+
+def downgrade() -> None:
+    """Drop the BM25 GIN index without blocking writes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_properties_search_vector;")
@@ -0,0 +1,44 @@
+"""add chat preference unique index
+
+Revision ID: a9c1d3e5f708
+Revises: f8b0c2d4e697
+Create Date: 2026-10-17 16:21:09.517384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c1d3e5f708'
+down_revision: Union[str, None] = 'f8b0c2d4e697'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Unique index on chat preferences, the conflict target of the chat upsert."""
+    # Keep the newest row of any duplicated chat preference
+    op.execute("""
+        DELETE FROM user_preferences up
+        USING user_preferences newer
+        WHERE up.source = 'chat' AND newer.source = 'chat'
+          AND up.user_id = newer.user_id
+          AND up.preference_key = newer.preference_key
+          AND up.preference_category = newer.preference_category
+          AND up.id < newer.id;
+    """)
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_user_preferences_chat
+            ON user_preferences (user_id, preference_key, preference_category, source)
+            WHERE source = 'chat';
+        """)
+
+
+def downgrade() -> None:
+    """Drop the chat preference unique index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_user_preferences_chat;")
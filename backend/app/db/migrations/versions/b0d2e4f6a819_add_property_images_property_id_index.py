@@ -0,0 +1,33 @@
+"""add property_images property_id index
+
+Revision ID: b0d2e4f6a819
+Revises: a9c1d3e5f708
+Create Date: 2026-10-17 17:04:36.208914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0d2e4f6a819'
+down_revision: Union[str, None] = 'a9c1d3e5f708'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the property_images foreign key, probed by the NOT EXISTS image checks."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_property_images_property_id
+            ON property_images (property_id);
+        """)
+
+
+def downgrade() -> None:
+    """Drop the property_images foreign key index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_property_images_property_id;")
@@ -0,0 +1,49 @@
+"""add tenant preferences json
+
+Revision ID: b4d6e8f0a253
+Revises: 9e4f6a8b0c32
+Create Date: 2026-10-17 11:58:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6e8f0a253'
+down_revision: Union[str, None] = '9e4f6a8b0c32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add tenant_profiles.preferences_json and fill it from user_preferences."""
+    op.add_column('tenant_profiles', sa.Column('preferences_json', sa.JSON(), nullable=True))
+
+    # {category: {key: value}}; jsonb_object_agg keeps the last value for a repeated key
+    op.execute("""
+        UPDATE tenant_profiles tp
+        SET preferences_json = prefs.preferences_json
+        FROM (
+            SELECT user_id, json_object_agg(preference_category, kv) AS preferences_json
+            FROM (
+                SELECT user_id, preference_category,
+                       jsonb_object_agg(preference_key, preference_value ORDER BY id) AS kv
+                FROM user_preferences
+                GROUP BY user_id, preference_category
+            ) by_category
+            GROUP BY user_id
+        ) prefs
+        WHERE tp.user_id = prefs.user_id;
+    """)
+    op.execute("""
+        UPDATE tenant_profiles SET preferences_json = '{}'::json
+        WHERE preferences_json IS NULL;
+    """)
+
+
+def downgrade() -> None:
+    """Drop tenant_profiles.preferences_json."""
+    op.drop_column('tenant_profiles', 'preferences_json')
@@ -0,0 +1,38 @@
+"""add recommender partial indexes
+
+Revision ID: c5e7f9a1b364
+Revises: b4d6e8f0a253
+Create Date: 2026-10-17 12:31:46.280153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7f9a1b364'
+down_revision: Union[str, None] = 'b4d6e8f0a253'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Partial indexes over the rows the recommenders scan: active properties and tenants."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_properties_active
+            ON properties (id) WHERE is_active;
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_tenant
+            ON users (id) WHERE user_type = 'tenant';
+        """)
+
+
+def downgrade() -> None:
+    """Drop the recommender partial indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_tenant;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_properties_active;")
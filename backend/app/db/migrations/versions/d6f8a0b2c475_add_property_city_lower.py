@@ -0,0 +1,37 @@
+"""add property city_lower
+
+Revision ID: d6f8a0b2c475
+Revises: c5e7f9a1b364
+Create Date: 2026-10-17 12:54:03.771920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f8a0b2c475'
+down_revision: Union[str, None] = 'c5e7f9a1b364'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add properties.city_lower, fill it, and index it."""
+    op.add_column('properties', sa.Column('city_lower', sa.String(), nullable=True))
+    op.execute("UPDATE properties SET city_lower = lower(city) WHERE city IS NOT NULL;")
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_properties_city_lower
+            ON properties (city_lower);
+        """)
+
+
+def downgrade() -> None:
+    """Drop properties.city_lower and its index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_properties_city_lower;")
+    op.drop_column('properties', 'city_lower')
@@ -34,11 +34,8 @@ def upgrade() -> None:
             setweight(to_tsvector('english', coalesce(description, '')), 'B');
     """)
 
-    # Create GIN index for fast full-text search
-    op.execute("""
-        CREATE INDEX idx_properties_search_vector
-        ON properties USING gin(search_vector);
-    """)
+    # GIN index is built CONCURRENTLY in its own revision (9e4f6a8b0c32) so the
+    # build doesn't hold a write lock on properties inside this transaction
 
     # Create trigger to auto-update tsvector on INSERT/UPDATE
     op.execute("""
@@ -0,0 +1,33 @@
+"""add auto-generated user partial index
+
+Revision ID: e7a9b1c3d586
+Revises: d6f8a0b2c475
+Create Date: 2026-10-17 14:08:27.415632
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9b1c3d586'
+down_revision: Union[str, None] = 'd6f8a0b2c475'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Partial index over the users the Realtor16 fetcher creates, so the admin reset avoids a full scan."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_realtor16_auto
+            ON users (id) WHERE email LIKE '%realtor16.auto%';
+        """)
+
+
+def downgrade() -> None:
+    """Drop the auto-generated user partial index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_realtor16_auto;")
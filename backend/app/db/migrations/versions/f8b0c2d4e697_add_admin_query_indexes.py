@@ -0,0 +1,38 @@
+"""add admin query indexes
+
+Revision ID: f8b0c2d4e697
+Revises: e7a9b1c3d586
+Create Date: 2026-10-17 15:02:41.388105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8b0c2d4e697'
+down_revision: Union[str, None] = 'e7a9b1c3d586'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Indexes for the admin endpoints: per-landlord cleanup/counts and the verified landlord list."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_properties_landlord_active_created
+            ON properties (landlord_id, is_active, created_at);
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_landlord_profiles_verified
+            ON landlord_profiles (id) WHERE verification_status;
+        """)
+
+
+def downgrade() -> None:
+    """Drop the admin query indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_landlord_profiles_verified;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_properties_landlord_active_created;")
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.routes import auth, users, properties, profile, messages
@@ -7,92 +8,70 @@ from app.database import engine, Base
 
 from app.routes import image_analysis, chat_ai, recommendations
 from app.routes import admin_sync
-from app.metrics import attach_metrics
+from app.metrics import attach_metrics, attach_cprofile
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created/verified successfully")
-except Exception as e:
-    print(f"Database connection failed: {e}")
-    print("Backend will start but database operations may fail")
+# Schema is managed by Alembic. In dev, create any missing tables for convenience.
+if settings.ENV == "dev":
+    try:
+        Base.metadata.create_all(bind=engine)
+        print("Database tables created/verified successfully")
+    except Exception as e:
+        print(f"Database connection failed: {e}")
+        print("Backend will start but database operations may fail")
 
 app = FastAPI(
     title="HorizonHome API",
     description="API for HorizonHome - Personalized Housing Recommendation System",
-    version="0.1.0"
+    version="0.1.0",
+    # orjson renders every JSON response (models are still validated by response_model)
+    default_response_class=ORJSONResponse
 )
 
-# Attach metrics monitoring
+# Attach metrics monitoring (METRICS_ENABLED) and on-demand profiling (PROFILING_ENABLED)
 attach_metrics(app)
+attach_cprofile(app)
 
 origins = [
+    "http://localhost",          # Docker frontend
+    "http://localhost:80",       # Docker frontend with port
+    "http://localhost:3000",
     "http://localhost:5173",
     "http://127.0.0.1:5173",
+    "http://3.145.189.113",      # EC2 frontend
+    "http://3.145.189.113:80",   # EC2 frontend with port
 ]
-
-# Configure CORS
+if settings.ec2_public_ip and f"http://{settings.ec2_public_ip}" not in origins:
+    origins += [
+        f"http://{settings.ec2_public_ip}",       # EC2 frontend
+        f"http://{settings.ec2_public_ip}:80",    # EC2 frontend with port
+    ]
+
+# Configure CORS. Explicit methods/headers instead of "*", and browsers cache
+# the preflight for 10 minutes rather than sending OPTIONS before every call.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost",          # Docker frontend
-        "http://localhost:80",       # Docker frontend with port
-        "http://localhost:3000",
-        "http://localhost:5173",
-        "http://127.0.0.1:5173",
-        "http://3.145.189.113",      # EC2 frontend
-        "http://3.145.189.113:80"    # EC2 frontend with port
-    ],
+    allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(
-    users.router,
-    prefix=f"{settings.API_V1_STR}/users",
-    tags=["Users"]
-)
-
-app.include_router(
-    auth.router,
-    prefix=f"{settings.API_V1_STR}/auth",
-    tags=["Authentication"]
-)
-
-# New property and profile routes
-app.include_router(
-    properties.router,
-    prefix=f"{settings.API_V1_STR}/properties",
-    tags=["Properties"]
-)
-
-app.include_router(
-    profile.router,
-    prefix=f"{settings.API_V1_STR}/profile",
-    tags=["User Profiles"]
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Admin-Key"],
+    max_age=600,
 )
 
-# For recommendations:
+# Include routers, once each: (router, path under API_V1_STR, OpenAPI tag)
+ROUTERS = [
+    (users.router, "/users", "Users"),
+    (auth.router, "/auth", "Authentication"),
+    (properties.router, "/properties", "Properties"),
+    (profile.router, "/profile", "User Profiles"),
+    (image_analysis.router, "/images", "Image Analysis"),
+    (chat_ai.router, "/chat", "Chat"),
+    (recommendations.router, "/recommendations", "Recommendations"),
+    (messages.router, "/messages", "Messages"),
+    (admin_sync.router, "", "Admin Management"),
+]
 
-app.include_router(
-    image_analysis.router,
-    prefix=f"{settings.API_V1_STR}/images",
-    tags=["Image Analysis"]
-)
-
-app.include_router(
-    chat_ai.router,
-    prefix=f"{settings.API_V1_STR}/chat",
-    tags=["Chat"]
-)
-
-app.include_router(
-    recommendations.router,
-    prefix=f"{settings.API_V1_STR}/recommendations",
-    tags=["Recommendations"]
-)
+for router, prefix, tag in ROUTERS:
+    app.include_router(router, prefix=f"{settings.API_V1_STR}{prefix}", tags=[tag])
 
 # app.include_router(
 #     map.router,
@@ -106,15 +85,3 @@ def root():
     Root endpoint - can be used for health checks
     """
     return {"message": "Welcome to HorizonHome API"}
-
-app.include_router(
-    messages.router,
-    prefix=f"{settings.API_V1_STR}/messages",
-    tags=["Messages"]
-)
-
-app.include_router(
-    admin_sync.router,
-    prefix=f"{settings.API_V1_STR}",
-    tags=["Admin Management"]
-)
\ No newline at end of file
@@ -5,16 +5,50 @@ Simple metrics middleware for tracking API performance.
 Tracks:
 - Request latency (p50, p95, p99 percentiles)
 - Queries per second (QPS) over 1 minute window
+
+Also provides an opt-in cProfile middleware for profiling single requests.
 """
 
+import array
+import cProfile
+import io
+import pstats
 import time
-from collections import deque
+
+import numpy as np
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
 
 
 # Global storage for metrics
-lat_hist = deque(maxlen=1000)  # Last 1000 request latencies
-req_1m = deque()  # Request timestamps in last 1 minute
+# Last 1000 request latencies in a preallocated ring of C doubles: one store per
+# request, no float objects or deque nodes kept alive
+LAT_WINDOW = 1000
+lat_buf = array.array("d", [0.0] * LAT_WINDOW)
+lat_idx = 0
+lat_count = 0
+
+# Requests per second for the last 60 seconds, slot = second % 60.
+# Seconds come from perf_counter (monotonic), which the middleware already reads.
+qps_buckets = array.array("Q", [0] * 60)
+_last_sec = 0
+
+
+def _advance(sec: int):
+    """Zero the slots of the seconds that passed with no requests."""
+    global _last_sec
+    if sec > _last_sec:
+        stale = min(sec - _last_sec, 60)
+        for i in range(1, stale + 1):
+            qps_buckets[(_last_sec + i) % 60] = 0
+        _last_sec = sec
+
+
+def _count_request(sec: int):
+    _advance(sec)
+    qps_buckets[sec % 60] += 1
 
 
 def attach_metrics(app: FastAPI):
@@ -25,38 +59,47 @@ def attach_metrics(app: FastAPI):
         from app.metrics import attach_metrics
         app = FastAPI()
         attach_metrics(app)
+
+    Does nothing unless METRICS_ENABLED is set, so deployments that don't
+    scrape /metrics skip the middleware layer entirely.
     """
+    if not settings.METRICS_ENABLED:
+        return
 
     @app.middleware("http")
     async def timing_middleware(request: Request, call_next):
         """Middleware to track request latency and count."""
+        global lat_idx, lat_count
+
         # Start timer
         t0 = time.perf_counter()
 
         # Process request
         response = await call_next(request)
 
-        # Calculate latency in milliseconds
-        dt = (time.perf_counter() - t0) * 1000
-        lat_hist.append(dt)
-
-        # Track request timestamp
-        now = time.time()
-        req_1m.append(now)
+        # Calculate latency in milliseconds; the end reading doubles as the QPS clock
+        now = time.perf_counter()
+        dt = (now - t0) * 1000
+        _count_request(int(now))
 
-        # Remove requests older than 60 seconds
-        while req_1m and now - req_1m[0] > 60:
-            req_1m.popleft()
+        lat_buf[lat_idx] = dt
+        lat_idx = (lat_idx + 1) % LAT_WINDOW
+        if lat_count < LAT_WINDOW:
+            lat_count += 1
 
         return response
 
     @app.get("/metrics", tags=["Monitoring"])
-    def get_metrics():
+    async def get_metrics():
         """
         Get API performance metrics.
 
+        Work is bounded (a C pass over at most 1000 doubles and a sum of 60
+        counters), so it runs on the event loop without a threadpool hop.
+
         Returns:
-            - latency_ms: Request latency percentiles (p50, p95, p99) in milliseconds
+            - latency_ms: Request latency percentiles (p50, p95, p99) over the
+              last 1000 requests, in milliseconds
             - qps_1m: Queries per second over the last 1 minute
 
         Example response:
@@ -65,22 +108,51 @@ def attach_metrics(app: FastAPI):
                 "qps_1m": 5.23
             }
         """
-        # Calculate percentiles
-        arr = sorted(lat_hist)
-        n = len(arr)
+        _advance(int(time.perf_counter()))
 
-        def percentile(p):
-            """Calculate percentile from sorted array."""
-            if n == 0:
-                return None
-            idx = min(int(p * (n - 1)), n - 1)
-            return round(arr[idx], 1)
+        # Zero-copy view over the ring; the order of samples doesn't matter.
+        # np.partition selects the three ranks in O(n) without a full sort, and
+        # works on its own copy, so later writes to the ring can't race it.
+        arr = np.frombuffer(lat_buf, dtype=np.float64)[:lat_count]
+        n = len(arr)
+        if n:
+            ranks = [int(p * (n - 1)) for p in (0.5, 0.95, 0.99)]
+            p50, p95, p99 = (round(float(v), 1) for v in np.partition(arr, ranks)[ranks])
+        else:
+            p50 = p95 = p99 = None
 
         return {
             "latency_ms": {
-                "p50": percentile(0.5),   # Median
-                "p95": percentile(0.95),  # 95th percentile
-                "p99": percentile(0.99)   # 99th percentile
+                "p50": p50,   # Median
+                "p95": p95,   # 95th percentile
+                "p99": p99    # 99th percentile
             },
-            "qps_1m": round(len(req_1m) / 60, 2)  # Queries per second
+            "qps_1m": round(sum(qps_buckets) / 60, 2)  # Queries per second
         }
+
+
+def attach_cprofile(app: FastAPI):
+    """
+    Attach a middleware that profiles a request when it has ?profile=1.
+
+    The response is replaced by the top 30 functions by cumulative time.
+    Only registered when PROFILING_ENABLED is set; not for production.
+    """
+    if not settings.PROFILING_ENABLED:
+        return
+
+    @app.middleware("http")
+    async def cprofile_middleware(request: Request, call_next):
+        if request.query_params.get("profile") != "1":
+            return await call_next(request)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+        return PlainTextResponse(out.getvalue(), status_code=response.status_code)
@@ -1,5 +1,6 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, Float, Table, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, Float, Table, JSON, Index, event, select, text, update
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
 
 from app.database import Base
@@ -29,6 +30,12 @@ class User(Base):
     User model representing registered users
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Roommate candidates: tenants only
+        Index("ix_users_tenant", "id", postgresql_where=text("user_type = 'tenant'")),
+        # Landlord users auto-created by the Realtor16 fetcher, removed on admin reset
+        Index("ix_users_realtor16_auto", "id", postgresql_where=text("email LIKE '%realtor16.auto%'")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -70,6 +77,7 @@ class TenantProfile(Base):
     preferred_location = Column(String, nullable=True)
     preferred_core_lat = Column(Float, nullable=True)  # Latitude of preferred core location
     preferred_core_lng = Column(Float, nullable=True)  # Longitude of preferred core location
+    preferences_json = Column(JSON, nullable=True)  # {category: {key: value}}, mirrors user_preferences
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Recommendation lists
@@ -84,6 +92,10 @@ class LandlordProfile(Base):
     Profile for users who own and list properties (landlords)
     """
     __tablename__ = "landlord_profiles"
+    __table_args__ = (
+        # Admin list of real (API-verified) landlords, paged by id
+        Index("ix_landlord_profiles_verified", "id", postgresql_where=text("verification_status")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
@@ -109,6 +121,16 @@ class LandlordProfile(Base):
 class UserPreference(Base):
     """UserPreference Model for storing user-specific preferences"""
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        # Conflict target for the chat preference upsert (one row per key and category)
+        Index(
+            "uq_user_preferences_chat",
+            "user_id", "preference_key", "preference_category", "source",
+            unique=True,
+            postgresql_where=text("source = 'chat'"),
+            sqlite_where=text("source = 'chat'"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -128,6 +150,12 @@ class Property(Base):
     Property model representing property listings
     """
     __tablename__ = "properties"
+    __table_args__ = (
+        # Recommendation candidates: active listings only
+        Index("ix_properties_active", "id", postgresql_where=text("is_active")),
+        # Admin cleanup and per-landlord property counts / freshness
+        Index("ix_properties_landlord_active_created", "landlord_id", "is_active", "created_at"),
+    )
 
     # Basic info:
     id = Column(Integer, primary_key=True, index=True)
@@ -154,6 +182,7 @@ class Property(Base):
     longitude = Column(Float, nullable=True)
     address = Column(String, nullable=True)
     city = Column(String, nullable=True)
+    city_lower = Column(String, nullable=True, index=True)  # lower(city), kept by _set_city_lower
     postal_code = Column(String, nullable=True)
     
     # 3rd Party API Data Fields
@@ -183,7 +212,8 @@ class PropertyImage(Base):
     __tablename__ = "property_images"
     
     id = Column(Integer, primary_key=True, index=True)
-    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
+    # Indexed: per-property image lookups and the "has no images" NOT EXISTS checks
+    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False, index=True)
     image_url = Column(String, nullable=False)
     is_primary = Column(Boolean, default=False)  # 是否为主图
     labels = Column(JSON, nullable=True)  # 图片分析标签
@@ -239,4 +269,58 @@ class Comment(Base):
     
     # Relationships
     user = relationship("User", back_populates="comments")
-    property = relationship("Property", back_populates="comments")
\ No newline at end of file
+    property = relationship("Property", back_populates="comments")
+
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_city_lower(mapper, connection, target):
+    """Denormalize the lowercased city so location matching compares a plain indexed column"""
+    target.city_lower = target.city.lower() if target.city else None
+
+
+def refresh_preferences_json(connection, user_ids) -> dict:
+    """
+    Rebuild TenantProfile.preferences_json for the given users from user_preferences
+
+    Later rows win when a key repeats within a category. Returns the new maps
+    keyed by user id.
+    """
+    user_ids = list(user_ids)
+    maps = {uid: {} for uid in user_ids}
+    rows = connection.execute(
+        select(
+            UserPreference.user_id,
+            UserPreference.preference_category,
+            UserPreference.preference_key,
+            UserPreference.preference_value,
+        )
+        .where(UserPreference.user_id.in_(user_ids))
+        .order_by(UserPreference.id)
+    )
+    for uid, category, key, value in rows:
+        maps[uid].setdefault(category, {})[key] = value
+
+    for uid, prefs in maps.items():
+        connection.execute(
+            update(TenantProfile).where(TenantProfile.user_id == uid).values(preferences_json=prefs)
+        )
+    return maps
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_preferences_json(session, flush_context):
+    """Keep preferences_json in step with every flush that touches UserPreference rows"""
+    changed = [
+        obj for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, UserPreference)
+    ]
+    if not changed:
+        return
+
+    maps = refresh_preferences_json(session.connection(), {obj.user_id for obj in changed})
+    # Profiles already loaded in this session see the new value without a reload
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, TenantProfile) and obj.user_id in maps:
+            set_committed_value(obj, "preferences_json", maps[obj.user_id])
@@ -0,0 +1,64 @@
+# app/rate_limit.py
+"""
+Small asyncio rate limiter for outbound API calls.
+
+Spaces acquisitions evenly so that at most `rate_per_minute` calls start in
+any minute, instead of bursting and then backing off on 429s. An optional
+daily cap stops handing out slots once that many calls were made since
+midnight (UTC).
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timezone
+from typing import Optional
+
+
+class RateLimitExceeded(Exception):
+    """Raised by acquire() once the daily cap has been used up."""
+
+
+class AsyncRateLimiter:
+    def __init__(self, rate_per_minute: float, daily_cap: Optional[int] = None):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.daily_cap = daily_cap
+        self._next_slot = 0.0
+        self._day: Optional[date] = None
+        self._used_today = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return (
+            self.daily_cap is not None
+            and self._day == datetime.now(timezone.utc).date()
+            and self._used_today >= self.daily_cap
+        )
+
+    async def acquire(self) -> None:
+        """Wait for the next free slot. Raises RateLimitExceeded past the daily cap."""
+        async with self._lock:
+            today = datetime.now(timezone.utc).date()
+            if today != self._day:
+                self._day = today
+                self._used_today = 0
+            if self.daily_cap is not None and self._used_today >= self.daily_cap:
+                raise RateLimitExceeded(f"Daily cap of {self.daily_cap} API calls reached")
+            self._used_today += 1
+
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after a 429 with Retry-After."""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
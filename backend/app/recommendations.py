@@ -1,12 +1,17 @@
 # app/recommendations.py
 from typing import List, Tuple, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, case, event, func, inspect, literal, or_, select
+from sqlalchemy.orm import Session, joinedload
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 
+from app.cache import TTLCache
 from app.models import User, Property, UserPreference, TenantProfile, Interaction
 from app import schemas
 
+# int.bit_count is 3.10+
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
 class RecommendationEngine:
     """Housing recommendation engine that implements collaborative filtering and content-based algorithms"""
     
@@ -24,43 +29,41 @@ class RecommendationEngine:
         Returns:
             List of (Property, score) tuples sorted by score in descending order
         """
-        # Get user profile and preferences
-        user = self.db.query(User).filter(User.id == user_id).first()
+        # Get user and tenant profile in one query
+        user = self.db.query(User).options(joinedload(User.tenant_profile)).filter(User.id == user_id).first()
         if not user or user.user_type != "tenant":
             return []
             
-        # Get tenant profile
-        tenant_profile = self.db.query(TenantProfile).filter(
-            TenantProfile.user_id == user_id
-        ).first()
-        
+        tenant_profile = user.tenant_profile
         if not tenant_profile:
             return []
             
-        # Get user preferences
-        user_prefs = self.db.query(UserPreference).filter(
-            UserPreference.user_id == user_id
-        ).all()
-        
-        # Create preference map
-        pref_map = {}
-        for pref in user_prefs:
-            pref_map[pref.preference_key] = pref.preference_value
-            
-        # Get all active properties
-        all_properties = self.db.query(Property).filter(Property.is_active == True).all()
-        
-        # Calculate scores for each property
-        property_scores = []
-        for prop in all_properties:
-            score = self._calculate_property_score(prop, tenant_profile, pref_map)
-            property_scores.append((prop, score))
+        # Create preference map, from the profile's denormalized copy when it has one
+        if tenant_profile.preferences_json is not None:
+            pref_map = {
+                key: value
+                for category_prefs in tenant_profile.preferences_json.values()
+                for key, value in category_prefs.items()
+            }
+        else:
+            user_prefs = self.db.query(UserPreference).filter(
+                UserPreference.user_id == user_id
+            ).all()
+            pref_map = {}
+            for pref in user_prefs:
+                pref_map[pref.preference_key] = pref.preference_value
             
-        # Sort by score
-        property_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top recommendations
-        return property_scores[:limit]
+        # Score in the database so only the top `limit` rows come back
+        score = self._property_score_expression(tenant_profile, pref_map).label("score")
+        rows = (
+            self.db.query(Property, score)
+            .filter(Property.is_active == True)
+            .order_by(score.desc(), Property.id)
+            .limit(limit)
+            .all()
+        )
+
+        return [(prop, float(prop_score)) for prop, prop_score in rows]
     
     def get_roommate_recommendations_for_user(self, user_id: int, limit: int = 10) -> List[Tuple[User, float]]:
         """
@@ -73,136 +76,252 @@ class RecommendationEngine:
         Returns:
             List of (User, score) tuples sorted by score in descending order
         """
-        # Get user
-        user = self.db.query(User).filter(User.id == user_id).first()
+        # Get user and tenant profile in one query
+        user = self.db.query(User).options(joinedload(User.tenant_profile)).filter(User.id == user_id).first()
         if not user or user.user_type != "tenant":
             return []
         
-        # Get tenant profile
-        tenant_profile = self.db.query(TenantProfile).filter(
-            TenantProfile.user_id == user_id
-        ).first()
-        
+        tenant_profile = user.tenant_profile
         if not tenant_profile:
             return []
         
-        # Get all potential roommates (tenant users that are not the current user)
-        potential_roommates = self.db.query(User).filter(
-            User.user_type == "tenant",
-            User.id != user_id
+        # Get all potential roommates (tenant users that are not the current user) as
+        # plain rows with just the scoring columns; full objects only for the winners
+        candidates = self.db.execute(
+            select(
+                User.id,
+                TenantProfile.id.label("profile_id"),
+                TenantProfile.budget,
+                TenantProfile.preferred_location,
+                TenantProfile.preferences_json,
+            )
+            .outerjoin(TenantProfile, TenantProfile.user_id == User.id)
+            .where(User.user_type == "tenant", User.id != user_id)
         ).all()
-        
-        # Calculate match scores
-        roommate_scores = []
-        for roommate in potential_roommates:
-            score = self._calculate_roommate_compatibility(user_id, roommate.id)
-            roommate_scores.append((roommate, score))
-        
-        # Sort by score
-        roommate_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top recommendations
-        return roommate_scores[:limit]
+        if not candidates:
+            return []
+
+        # Lifestyle preferences come from preferences_json
+        lifestyle: Dict[int, Dict[str, str]] = {}
+        if tenant_profile.preferences_json is not None:
+            lifestyle[user_id] = tenant_profile.preferences_json.get("lifestyle", {})
+        for row in candidates:
+            if row.preferences_json is not None:
+                lifestyle[row.id] = row.preferences_json.get("lifestyle", {})
+        # Profiles written before preferences_json existed fall back to one query
+        missing = [user_id] if user_id not in lifestyle else []
+        missing += [row.id for row in candidates if row.profile_id is not None and row.id not in lifestyle]
+        if missing:
+            lifestyle_rows = self.db.query(
+                UserPreference.user_id, UserPreference.preference_key, UserPreference.preference_value
+            ).filter(
+                UserPreference.user_id.in_(missing),
+                UserPreference.preference_category == "lifestyle"
+            ).all()
+            for uid, key, value in lifestyle_rows:
+                lifestyle.setdefault(uid, {})[key] = value
+
+        # Calculate match scores for all candidates in one array pass
+        masks = self._lifestyle_masks(lifestyle)
+        scores = self._score_roommates(
+            tenant_profile.budget,
+            # Lowercase each location once here rather than once per comparison
+            tenant_profile.preferred_location.lower() if tenant_profile.preferred_location else None,
+            masks.get(user_id, (0, 0)),
+            candidates,
+            [masks.get(row.id, (0, 0)) for row in candidates],
+        )
+
+        # Pick the top recommendations without sorting every candidate
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        top_ids = [candidates[i].id for i in top]
+        users = {
+            u.id: u
+            for u in self.db.query(User).options(joinedload(User.tenant_profile)).filter(User.id.in_(top_ids)).all()
+        }
+        return [(users[candidates[i].id], float(scores[i])) for i in top]
     
-    def _calculate_property_score(self, property: Property, tenant_profile: TenantProfile, 
-                                 preferences: Dict[str, Any]) -> float:
-        """Calculate match score between a property and user preferences"""
-        score = 0.0
-        
+    def _property_score_expression(self, tenant_profile: TenantProfile, preferences: Dict[str, Any]):
+        """
+        Build the SQL expression for the match score between a property and user preferences
+
+        Preference values are bound as parameters, so the same statement is
+        reused across users.
+        """
+        score: ColumnElement[float] = literal(0.0)
+
         # Budget match (higher score if property price is within budget)
-        if tenant_profile.budget and property.price <= tenant_profile.budget:
-            score += 0.3
-        elif tenant_profile.budget:
+        budget = tenant_profile.budget
+        if budget and budget > 0:
             # Score decreases as price exceeds budget
-            price_ratio = tenant_profile.budget / property.price if property.price > 0 else 0
-            score += 0.3 * max(0, min(1, price_ratio))
-        
+            score = score + case(
+                (Property.price <= budget, 0.3),
+                (Property.price > 0, 0.3 * literal(budget) / Property.price),
+                else_=0.0,
+            )
+
         # Location match
-        if tenant_profile.preferred_location and property.city:
-            if tenant_profile.preferred_location.lower() == property.city.lower():
-                score += 0.3
-            elif property.address and tenant_profile.preferred_location.lower() in property.address.lower():
-                score += 0.2
-        
+        if tenant_profile.preferred_location:
+            location = tenant_profile.preferred_location.lower()
+            score = score + case(
+                (or_(Property.city.is_(None), Property.city == ""), 0.0),
+                (Property.city_lower == location, 0.3),
+                (func.lower(Property.address).contains(location, autoescape=True), 0.2),
+                else_=0.0,
+            )
+
         # Property type match
-        if preferences.get('property_type') and property.property_type:
-            if preferences['property_type'].lower() == property.property_type.lower():
-                score += 0.2
-        
+        if preferences.get('property_type'):
+            score = score + case(
+                (func.lower(Property.property_type) == preferences['property_type'].lower(), 0.2),
+                else_=0.0,
+            )
+
         # Bedroom match
-        if preferences.get('bedrooms') and property.bedrooms:
-            if int(preferences['bedrooms']) == property.bedrooms:
-                score += 0.1
-        
+        if preferences.get('bedrooms') and int(preferences['bedrooms']):
+            score = score + case((Property.bedrooms == int(preferences['bedrooms']), 0.1), else_=0.0)
+
         # Bathroom match
-        if preferences.get('bathrooms') and property.bathrooms:
-            if float(preferences['bathrooms']) == property.bathrooms:
-                score += 0.1
-        
+        if preferences.get('bathrooms') and float(preferences['bathrooms']):
+            score = score + case((Property.bathrooms == float(preferences['bathrooms']), 0.1), else_=0.0)
+
         return score
-    
-    def _calculate_roommate_compatibility(self, user_id1: int, user_id2: int) -> float:
-        """Calculate compatibility score between two potential roommates"""
-        # Get tenant profiles
-        profile1 = self.db.query(TenantProfile).filter(
-            TenantProfile.user_id == user_id1
-        ).first()
-        
-        profile2 = self.db.query(TenantProfile).filter(
-            TenantProfile.user_id == user_id2
-        ).first()
-        
-        if not profile1 or not profile2:
-            return 0.0
-        
-        score = 0.0
-        
+
+    @staticmethod
+    def _lifestyle_masks(lifestyle: Dict[int, Dict[str, str]]) -> Dict[int, Tuple[int, int]]:
+        """
+        Encode each user's lifestyle preferences as two bitsets
+
+        Every distinct key gets a bit in key_mask and every distinct (key, value)
+        pair a bit in pair_mask, so comparing two users is an AND/OR and a popcount.
+        """
+        key_bits: Dict[str, int] = {}
+        pair_bits: Dict[Tuple[str, str], int] = {}
+        masks = {}
+        for uid, prefs in lifestyle.items():
+            key_mask = pair_mask = 0
+            for key, value in prefs.items():
+                key_mask |= 1 << key_bits.setdefault(key, len(key_bits))
+                pair_mask |= 1 << pair_bits.setdefault((key, value), len(pair_bits))
+            masks[uid] = (key_mask, pair_mask)
+        return masks
+
+    @staticmethod
+    def _score_roommates(budget: Optional[float], location: Optional[str], masks: Tuple[int, int],
+                         candidates: List[Any], candidate_masks: List[Tuple[int, int]]) -> np.ndarray:
+        """
+        Calculate compatibility scores between a user and each candidate roommate
+
+        `location` is already lowercased; candidates are rows with profile_id,
+        budget and preferred_location; lifestyle preferences are the
+        (key_mask, pair_mask) bitsets from _lifestyle_masks. Budget and location
+        are scored over arrays; candidates without a profile score 0.
+        """
+        n = len(candidates)
+        has_profile = np.fromiter((row.profile_id is not None for row in candidates), dtype=bool, count=n)
+        scores = np.zeros(n, dtype=np.float64)
+
         # Budget compatibility (closer budgets = higher score)
-        if profile1.budget and profile2.budget:
-            budget_diff = abs(profile1.budget - profile2.budget)
-            max_budget = max(profile1.budget, profile2.budget)
-            budget_score = 1.0 - (budget_diff / max_budget if max_budget > 0 else 0)
-            score += 0.3 * budget_score
-        
+        if budget:
+            budgets = np.fromiter((row.budget or 0.0 for row in candidates), dtype=np.float64, count=n)
+            max_budget = np.maximum(budgets, budget)
+            safe_max = np.where(max_budget > 0, max_budget, 1.0)
+            budget_score = 1.0 - np.where(max_budget > 0, np.abs(budgets - budget) / safe_max, 0.0)
+            scores += np.where(budgets != 0, 0.3 * budget_score, 0.0)
+
         # Location preference match
-        if profile1.preferred_location and profile2.preferred_location:
-            if profile1.preferred_location.lower() == profile2.preferred_location.lower():
-                score += 0.3
-        
-        # Get user preferences
-        prefs1 = self.db.query(UserPreference).filter(
-            UserPreference.user_id == user_id1,
-            UserPreference.preference_category == "lifestyle"
-        ).all()
-        
-        prefs2 = self.db.query(UserPreference).filter(
-            UserPreference.user_id == user_id2,
-            UserPreference.preference_category == "lifestyle"
-        ).all()
-        
-        # Create preference maps
-        pref_map1 = {p.preference_key: p.preference_value for p in prefs1}
-        pref_map2 = {p.preference_key: p.preference_value for p in prefs2}
-        
-        # Lifestyle preference match
-        matching_prefs = 0
-        total_prefs = len(set(pref_map1.keys()).union(set(pref_map2.keys())))
-        
-        for key in pref_map1:
-            if key in pref_map2 and pref_map1[key] == pref_map2[key]:
-                matching_prefs += 1
-        
-        if total_prefs > 0:
-            score += 0.4 * (matching_prefs / total_prefs)
-        
-        return score
+        if location:
+            locations = np.array(
+                [row.preferred_location.lower() if row.preferred_location else None for row in candidates],
+                dtype=object
+            )
+            scores += np.where(locations == location, 0.3, 0.0)
+
+        # Lifestyle preference match: keys with equal values over all keys either set
+        key_mask, pair_mask = masks
+        total_prefs = np.fromiter((_popcount(key_mask | k) for k, _ in candidate_masks), dtype=np.float64, count=n)
+        matching_prefs = np.fromiter((_popcount(pair_mask & p) for _, p in candidate_masks), dtype=np.float64, count=n)
+        scores += np.where(total_prefs > 0, 0.4 * matching_prefs / np.maximum(total_prefs, 1), 0.0)
+
+        return np.where(has_profile, scores, 0.0)
+
+# (kind, user_id, limit) -> [(id, score), ...]. Ids rather than ORM objects so
+# hits are re-loaded into the caller's session.
+_recommendation_cache = TTLCache(maxsize=10_000, ttl=60)
+
+# Fields that feed a score; None means any column. Changes elsewhere (e.g. the
+# recommended_* relationships the routes rewrite on every call) don't invalidate.
+_SCORING_FIELDS = {
+    Property: None,
+    TenantProfile: ("budget", "preferred_location"),
+    UserPreference: None,
+    Interaction: None,
+    User: ("user_type",),
+}
+
+
+def _touches_scoring(obj) -> bool:
+    fields = _SCORING_FIELDS.get(type(obj), ())
+    if fields is None:
+        fields = [attr.key for attr in inspect(obj).mapper.column_attrs]
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_recommendations_stale(session, flush_context):
+    if any(type(obj) in _SCORING_FIELDS for obj in (*session.new, *session.deleted)) \
+            or any(_touches_scoring(obj) for obj in session.dirty):
+        session.info["recommendations_stale"] = True
+
+
+def invalidate_recommendations() -> None:
+    """Drop all cached recommendations; for bulk writes that bypass the flush hooks."""
+    _recommendation_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_recommendations(session):
+    if session.info.pop("recommendations_stale", False):
+        invalidate_recommendations()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_mark(session):
+    session.info.pop("recommendations_stale", None)
+
+
+def _load_cached(db: Session, model, cached: List[Tuple[int, float]], *options) -> List[Tuple[Any, float]]:
+    if not cached:
+        return []
+    query = db.query(model).options(*options).filter(model.id.in_([i for i, _ in cached]))
+    by_id = {obj.id: obj for obj in query.all()}
+    return [(by_id[i], score) for i, score in cached if i in by_id]
+
 
 def get_property_recommendations_for_user(db: Session, user_id: int, limit: int = 10) -> List[Tuple[Property, float]]:
     """Wrapper function to get property recommendations using the RecommendationEngine"""
+    key = ("properties", user_id, limit)
+    cached = _recommendation_cache.get(key)
+    if cached is not None:
+        return _load_cached(db, Property, cached)
+
     engine = RecommendationEngine(db)
-    return engine.get_property_recommendations_for_user(user_id, limit)
+    results = engine.get_property_recommendations_for_user(user_id, limit)
+    _recommendation_cache.set(key, [(prop.id, score) for prop, score in results])
+    return results
 
 def get_roommate_recommendations_for_user(db: Session, user_id: int, limit: int = 10) -> List[Tuple[User, float]]:
     """Wrapper function to get roommate recommendations using the RecommendationEngine"""
+    key = ("roommates", user_id, limit)
+    cached = _recommendation_cache.get(key)
+    if cached is not None:
+        return _load_cached(db, User, cached, joinedload(User.tenant_profile))
+
     engine = RecommendationEngine(db)
-    return engine.get_roommate_recommendations_for_user(user_id, limit)
\ No newline at end of file
+    results = engine.get_roommate_recommendations_for_user(user_id, limit)
+    _recommendation_cache.set(key, [(user.id, score) for user, score in results])
+    return results
@@ -1,52 +1,191 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.orm import Session, contains_eager, load_only
+from typing import Optional, List, TypedDict
+import asyncio
+import functools
+import hashlib
+import hmac
+import logging
 import os
-from datetime import datetime
-from sqlalchemy import text 
+import re
+import time
+import uuid
+import orjson
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, distinct, exists, func, insert, literal, or_, select, text, update
 
-from app.database import get_db
-from app.models import LandlordProfile, User, Property, PropertyImage  
+from app.cache import TTLCache
+from app.config import settings
+from app.database import SessionLocal, engine, get_db
+from app.rate_limit import AsyncRateLimiter, RateLimitExceeded
+from app.recommendations import invalidate_recommendations
+from app.models import LandlordProfile, TenantProfile, User, Property, PropertyImage
+from app.schemas import AdminLandlordDetail, AdminPropertyDetail, AdminPropertyDetailsResponse  
 from app.services.rapidapi_fetcher import RapidAPIFetcher
 from app.services.realtor16_fetcher import Realtor16Fetcher
 from app.services.multi_source_fetcher import MultiSourceFetcher
 from app.services.sync_scheduler import get_scheduler_status, manual_sync, start_property_sync, stop_property_sync
 from app.services.embedding_scheduler import update_embeddings_for_new_properties
+from app.services.property_enrichment import get_enrichment_service
 
-router = APIRouter()
+# 同时处理的管理请求上限，超出的请求排队等待，避免耗尽数据库连接池
+ADMIN_MAX_CONCURRENCY = int(os.getenv("ADMIN_MAX_CONCURRENCY", "16"))
+_admin_limit = asyncio.Semaphore(ADMIN_MAX_CONCURRENCY)
+
+async def admin_concurrency_guard():
+    """Hold an admin slot for the whole request, including its DB session."""
+    async with _admin_limit:
+        yield
+
+# 响应用 orjson 序列化，大列表 (批量结果/房东列表) 更快
+router = APIRouter(
+    dependencies=[Depends(admin_concurrency_guard)],
+    default_response_class=ORJSONResponse
+)
+
+logger = logging.getLogger(__name__)
+
+# RapidAPI 密钥，导入时读取一次；缺失时在这里提示一次，而不是每个请求都记录
+_RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
+if not _RAPIDAPI_KEY:
+    logger.warning("RAPIDAPI_KEY not configured; admin fetch endpoints will return 500")
+
+# 批量获取时同时处理的房东数量
+BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", "8"))
+
+# 最近多少小时内获取过房源的房东在批量获取时跳过
+REFRESH_HOURS = int(os.getenv("REFRESH_HOURS", "24"))
+
+# RapidAPI 配额: 每分钟请求数 (0 = 不限速) 和每日上限 (空 = 不限)
+RAPIDAPI_RPM = float(os.getenv("RAPIDAPI_RPM", "60"))
+RAPIDAPI_DAILY_CAP = int(os.getenv("RAPIDAPI_DAILY_CAP")) if os.getenv("RAPIDAPI_DAILY_CAP") else None
+rapidapi_limiter = AsyncRateLimiter(RAPIDAPI_RPM, daily_cap=RAPIDAPI_DAILY_CAP)
+
+# 429/5xx 时的重试次数和初始退避秒数
+FETCH_MAX_ATTEMPTS = 3
+FETCH_BACKOFF_SECONDS = 2.0
+
+# 批量获取时房东级 advisory lock 的命名空间 (pg_try_advisory_lock(ns, landlord_id))
+LANDLORD_FETCH_LOCK_NS = 7301
+
+@functools.lru_cache(maxsize=4)
+def _get_fetcher(source: str, api_key: str):
+    """按数据源和密钥复用获取器，使其HTTP连接池跨请求共享"""
+    return {
+        "realtor16": Realtor16Fetcher,
+        "rapidapi": RapidAPIFetcher,
+    }[source](api_key)
+
+# 房源统计里识别的匹兹堡街区，按顺序匹配地址
+PITTSBURGH_NEIGHBORHOODS = [
+    'Oakland', 'Shadyside', 'Squirrel Hill', 'Greenfield',
+    'Point Breeze', 'Regent Square', 'Bloomfield', 'Friendship'
+]
+
+# 房源描述中的链接标记: (关键词, 显示名称, 统计字段)
+LINK_MARKERS = [
+    (('realtor.com', 'realtor16'), "Realtor.com", "realtor_com_links"),
+    (('zillow.com',), "Zillow", "zillow_links"),
+    (('apartments.com',), "Apartments.com", "apartments_com_links"),
+    (('mls id:',), "MLS ID", "mls_ids"),
+]
+# 所有标记编译成一个正则，描述只扫描一遍；命中的分组名即统计字段
+_LINK_PATTERN = re.compile("|".join(
+    f"(?P<{stat_key}>{'|'.join(map(re.escape, needles))})"
+    for needles, _, stat_key in LINK_MARKERS
+))
+
+# 把 api_images (JSON 数组) 迁移到 property_images，跳过已有图片的房源；
+# 第一张为主图，并补上为空的 image_url。CTE 共享同一快照，skipped 统计的是迁移前的状态
+MIGRATE_API_IMAGES_SQL = text("""
+    WITH inserted AS (
+        INSERT INTO property_images (property_id, image_url, is_primary, labels, created_at)
+        SELECT p.id, e.value #>> '{}', e.ordinality = 1, NULL, timezone('utc', now())
+        FROM properties p
+        CROSS JOIN LATERAL json_array_elements(p.api_images) WITH ORDINALITY AS e(value, ordinality)
+        WHERE json_typeof(p.api_images) = 'array'
+          AND json_typeof(e.value) = 'string'
+          AND e.value #>> '{}' <> ''
+          AND NOT EXISTS (SELECT 1 FROM property_images pi WHERE pi.property_id = p.id)
+        RETURNING property_id
+    ), migrated AS (
+        SELECT property_id, count(*) AS n FROM inserted GROUP BY property_id
+    ), updated AS (
+        UPDATE properties p SET image_url = p.api_images ->> 0
+        FROM migrated m
+        WHERE p.id = m.property_id AND (p.image_url IS NULL OR p.image_url = '')
+    )
+    SELECT
+        (SELECT count(*) FROM migrated),
+        (SELECT coalesce(sum(n), 0) FROM migrated),
+        (SELECT count(*) FROM properties p
+         WHERE json_typeof(p.api_images) = 'array' AND json_array_length(p.api_images) > 0
+           AND EXISTS (SELECT 1 FROM property_images pi WHERE pi.property_id = p.id))
+""")
+
+# 后台任务 (批量获取/多数据源获取/手动同步) 的状态，保留一天
+_batch_jobs = TTLCache(maxsize=100, ttl=24 * 3600)
+
+# 管理接口响应缓存 (状态/房东列表)，写操作后清空
+_admin_cache = TTLCache(maxsize=64, ttl=60)
+
+def invalidate_admin_cache():
+    """Drop cached admin responses after landlords or properties change."""
+    _admin_cache.clear()
 
 # 管理员密钥验证
 ADMIN_SECRET = os.getenv("ADMIN_SECRET", "horizon-admin-2024")
+_ADMIN_SECRET_BYTES = ADMIN_SECRET.encode("utf-8")
 
-def verify_admin_key(x_admin_key: Optional[str] = Header(None)):
-    """验证管理员密钥"""
-    if not x_admin_key or x_admin_key != ADMIN_SECRET:
+async def verify_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """验证管理员密钥（常数时间比较）；不做 I/O，async 让它在事件循环上直接运行而不占线程池"""
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode("utf-8"), _ADMIN_SECRET_BYTES):
         raise HTTPException(
             status_code=403, 
             detail="Invalid or missing admin key. Use X-Admin-Key header."
         )
     return True
 
-class AdminFetchResponse(BaseModel):
+# 响应类型用 TypedDict：直接作为 dict 交给 orjson，不经过 Pydantic 校验
+def _etag_response(content, if_none_match: Optional[str]) -> Response:
+    """JSON response with an ETag over its body; 304 without a body if the client has it."""
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if if_none_match:
+        client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+class AdminFetchResponse(TypedDict):
     success: bool
     landlord_id: int
     total_fetched: int
     saved_count: int
     api_calls_used: int
     message: str
-    properties_preview: List[dict] = []
+    properties_preview: List[dict]
 
-class BatchFetchResponse(BaseModel):
+class LandlordResult(TypedDict, total=False):
+    landlord_id: int
+    success: bool
+    saved_count: int
+    total_fetched: int
+    message: str
+    error: str
+
+class BatchFetchResponse(TypedDict):
     total_landlords: int
     total_properties_saved: int
     total_api_calls_used: int
     successful_landlords: int
     failed_landlords: int
-    results: List[dict]
+    results: List[LandlordResult]
 
 @router.get("/admin/status")
-async def admin_status(
+def admin_status(
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
@@ -58,18 +197,21 @@ async def admin_status(
       -H "X-Admin-Key: your-admin-secret"
     """
     
+    cached = _admin_cache.get("admin:status")
+    if cached is not None:
+        return cached
+    
     # 检查API配置
-    rapidapi_key = os.getenv("RAPIDAPI_KEY")
+    rapidapi_key = _RAPIDAPI_KEY
     api_configured = bool(rapidapi_key and len(rapidapi_key) > 10)
     
     # 统计房东数量
-    total_landlords = db.query(LandlordProfile).count()
+    total_landlords = db.query(func.count(LandlordProfile.id)).scalar()
     
     # 统计房源数量
-    from app.models import Property
-    total_properties = db.query(Property).count()
+    total_properties = db.query(func.count(Property.id)).scalar()
     
-    return {
+    response = {
         "system_status": "healthy",
         "api_configured": api_configured,
         "admin_authenticated": True,
@@ -77,30 +219,48 @@ async def admin_status(
         "total_properties": total_properties,
         "rapidapi_key_length": len(rapidapi_key) if rapidapi_key else 0
     }
+    _admin_cache.set("admin:status", response, ttl=30)
+    return response
 
 @router.get("/admin/landlords")
-async def list_landlords(
+def list_landlords(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
     """
-    列出所有房东
+    列出房东（按ID分页，下一页传入上次返回的 next_cursor）
     
     使用方法:
-    curl -X GET "http://localhost:8000/api/v1/admin/landlords" \
+    curl -X GET "http://localhost:8000/api/v1/admin/landlords?limit=100&cursor=200" \
       -H "X-Admin-Key: your-admin-secret"
     """
     
-    landlords = db.query(LandlordProfile).all()
+    cache_key = ("admin:landlords", limit, cursor)
+    cached = _admin_cache.get(cache_key)
+    if cached is not None:
+        return _etag_response(cached, if_none_match)
+    
+    # 房东及其房源数量，一次查询
+    query = db.query(
+        LandlordProfile, func.count(Property.id)
+    ).outerjoin(
+        Property, Property.landlord_id == LandlordProfile.id
+    )
+    if cursor is not None:
+        query = query.filter(LandlordProfile.id > cursor)
+    landlords = query.group_by(LandlordProfile.id).order_by(LandlordProfile.id).limit(limit).all()
+    
+    # 总数与分页无关，所有页共用一个缓存项，翻页时只查一次 count()
+    total_landlords = _admin_cache.get("admin:landlords:total")
+    if total_landlords is None:
+        total_landlords = db.query(func.count(LandlordProfile.id)).scalar()
+        _admin_cache.set("admin:landlords:total", total_landlords, ttl=20)
     
     landlords_info = []
-    for landlord in landlords:
-        # 统计该房东的房源数量
-        from app.models import Property
-        property_count = db.query(Property).filter(
-            Property.landlord_id == landlord.id
-        ).count()
-        
+    for landlord, property_count in landlords:
         landlords_info.append({
             "id": landlord.id,
             "user_id": landlord.user_id,
@@ -110,13 +270,16 @@ async def list_landlords(
             "created_at": landlord.created_at
         })
     
-    return {
-        "total_landlords": len(landlords),
-        "landlords": landlords_info
+    response = {
+        "total_landlords": total_landlords,
+        "landlords": landlords_info,
+        "next_cursor": landlords_info[-1]["id"] if len(landlords) == limit else None
     }
+    _admin_cache.set(cache_key, response, ttl=20)
+    return _etag_response(response, if_none_match)
 
-@router.post("/admin/fetch-properties/{landlord_id}", response_model=AdminFetchResponse)
-async def admin_fetch_properties(
+@router.post("/admin/fetch-properties/{landlord_id}")
+def admin_fetch_properties(
     landlord_id: int,
     property_count: int = 20,
     admin_verified: bool = Depends(verify_admin_key),
@@ -131,18 +294,18 @@ async def admin_fetch_properties(
     """
     
     # 检查房东是否存在
-    landlord = db.query(LandlordProfile).filter(
-        LandlordProfile.id == landlord_id
-    ).first()
+    landlord_exists = db.execute(
+        select(exists().where(LandlordProfile.id == landlord_id))
+    ).scalar()
     
-    if not landlord:
+    if not landlord_exists:
         raise HTTPException(
             status_code=404, 
             detail=f"Landlord with ID {landlord_id} not found"
         )
     
     # 检查API密钥
-    api_key = os.getenv("RAPIDAPI_KEY")
+    api_key = _RAPIDAPI_KEY
     if not api_key:
         raise HTTPException(
             status_code=500, 
@@ -156,7 +319,7 @@ async def admin_fetch_properties(
     try:
         # 初始化获取器
         # fetcher = RapidAPIFetcher(api_key)
-        fetcher = Realtor16Fetcher(api_key)
+        fetcher = _get_fetcher("realtor16", api_key)
         
         # 获取房源
         result = fetcher.get_real_properties(
@@ -164,9 +327,10 @@ async def admin_fetch_properties(
             landlord_id=landlord_id,
             limit=property_count
         )
+        invalidate_admin_cache()
         
         if result['success']:
-            return AdminFetchResponse(
+            return ORJSONResponse(AdminFetchResponse(
                 success=True,
                 landlord_id=landlord_id,
                 total_fetched=result.get('total_fetched', 0),
@@ -174,7 +338,7 @@ async def admin_fetch_properties(
                 api_calls_used=result.get('api_calls_used', 1),
                 message=f"Successfully fetched properties for landlord {landlord_id}",
                 properties_preview=result.get('properties', [])[:3]  # 显示前3个
-            )
+            ))
         else:
             raise HTTPException(
                 status_code=500,
@@ -187,31 +351,214 @@ async def admin_fetch_properties(
             detail=f"Error during property fetch: {str(e)}"
         )
 
-@router.post("/admin/fetch-all-landlords", response_model=BatchFetchResponse)
+def _new_job(total: Optional[int] = None) -> dict:
+    """登记一个后台任务，状态可通过 GET /admin/jobs/{job_id} 查询"""
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "queued",
+        "total": total,
+        "done": 0,
+        "created_at": datetime.utcnow(),
+        "result": None,
+        "error": None
+    }
+    _batch_jobs.set(job_id, job)
+    return job
+
+def _job_accepted(job: dict) -> ORJSONResponse:
+    return ORJSONResponse(
+        {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"{settings.API_V1_STR}/admin/jobs/{job['job_id']}"
+        },
+        status_code=202
+    )
+
+def _try_lock_landlord(conn, landlord_id: int) -> bool:
+    """
+    尝试获取房东的会话级 advisory lock，拿不到立即返回 False。
+    
+    不锁 landlord_profiles 行：fetcher 插入 Property 时的外键检查要对房东行加
+    FOR KEY SHARE，与行锁冲突。advisory lock 挂在连接上，fetcher 的 commit 不会释放它。
+    非 Postgres (测试用的 SQLite) 不加锁。
+    """
+    if conn.dialect.name != "postgresql":
+        return True
+    locked = conn.execute(
+        select(func.pg_try_advisory_lock(LANDLORD_FETCH_LOCK_NS, landlord_id))
+    ).scalar()
+    conn.commit()
+    return bool(locked)
+
+def _unlock_landlord(conn, landlord_id: int):
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(select(func.pg_advisory_unlock(LANDLORD_FETCH_LOCK_NS, landlord_id)))
+    conn.commit()
+
+def _fetch_for_landlord(fetcher, landlord_id: int, limit: int) -> dict:
+    """在独立的数据库连接中为单个房东获取房源（在线程池中运行）"""
+    with engine.connect() as conn:
+        # 并行的批量任务拿不到锁就跳过该房东，而不是重复获取
+        if not _try_lock_landlord(conn, landlord_id):
+            return {
+                'success': False,
+                'error': 'Landlord is being fetched by another job',
+                'saved_count': 0
+            }
+        try:
+            # 会话绑定在持锁的同一个连接上：只占用一个连接，commit 后锁仍然有效
+            db = SessionLocal(bind=conn)
+            try:
+                return fetcher.get_real_properties(db=db, landlord_id=landlord_id, limit=limit)
+            finally:
+                db.close()
+        finally:
+            _unlock_landlord(conn, landlord_id)
+
+async def _run_batch_fetch(job: dict, fetcher, landlord_ids: List[int], limit: int):
+    """后台执行批量获取，并把进度和结果写回任务状态"""
+    job["status"] = "running"
+    try:
+        await _batch_fetch(job, fetcher, landlord_ids, limit)
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+async def _batch_fetch(job: dict, fetcher, landlord_ids: List[int], limit: int):
+    results: List[LandlordResult] = []
+    total_saved = 0
+    total_api_calls = 0
+    successful_count = 0
+    failed_count = 0
+    
+    semaphore = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+    
+    async def _fetch_one(landlord_id: int) -> dict:
+        try:
+            return await _fetch_with_retry(landlord_id)
+        finally:
+            job["done"] += 1
+    
+    async def _fetch_with_retry(landlord_id: int) -> dict:
+        async with semaphore:
+            for attempt in range(FETCH_MAX_ATTEMPTS):
+                try:
+                    await rapidapi_limiter.acquire()
+                except RateLimitExceeded as e:
+                    return {'success': False, 'error': str(e), 'saved_count': 0}
+                result = await run_in_threadpool(
+                    _fetch_for_landlord, fetcher, landlord_id, limit
+                )
+                if result.get('rate_limit_remaining') == 0:
+                    # 本周期配额已用完，所有任务一起等到下个周期
+                    rapidapi_limiter.pause(60)
+                status = result.get('status_code')
+                retryable = status is not None and (status == 429 or status >= 500)
+                if result['success'] or not retryable or attempt == FETCH_MAX_ATTEMPTS - 1:
+                    return result
+                # 优先按 Retry-After 等待，否则指数退避；429 时其他任务也一起暂停
+                delay = result.get('retry_after') or FETCH_BACKOFF_SECONDS * 2 ** attempt
+                if status == 429:
+                    rapidapi_limiter.pause(delay)
+                await asyncio.sleep(delay)
+            return {'success': False, 'error': 'Retries exhausted', 'saved_count': 0}
+    
+    outcomes = await asyncio.gather(
+        *(_fetch_one(landlord_id) for landlord_id in landlord_ids),
+        return_exceptions=True
+    )
+    invalidate_admin_cache()
+    
+    for landlord_id, result in zip(landlord_ids, outcomes):
+        # return_exceptions 也会返回 CancelledError 等 BaseException，按失败记录而不是中断整个任务
+        if isinstance(result, BaseException):
+            failed_count += 1
+            results.append(LandlordResult(
+                landlord_id=landlord_id,
+                success=False,
+                saved_count=0,
+                error=str(result) or type(result).__name__
+            ))
+        elif result['success']:
+            successful_count += 1
+            saved_count = result.get('saved_count', 0)
+            total_saved += saved_count
+            total_api_calls += result.get('api_calls_used', 1)
+            
+            results.append(LandlordResult(
+                landlord_id=landlord_id,
+                success=True,
+                saved_count=saved_count,
+                total_fetched=result.get('total_fetched', 0),
+                message=f"Successfully processed {saved_count} properties"
+            ))
+        else:
+            failed_count += 1
+            results.append(LandlordResult(
+                landlord_id=landlord_id,
+                success=False,
+                saved_count=0,
+                error=result.get('error', 'Unknown error')
+            ))
+    
+    job["result"] = BatchFetchResponse(
+        total_landlords=len(landlord_ids),
+        total_properties_saved=total_saved,
+        total_api_calls_used=total_api_calls,
+        successful_landlords=successful_count,
+        failed_landlords=failed_count,
+        results=results
+    )
+    job["status"] = "completed"
+
+@router.post("/admin/fetch-all-landlords")
 async def admin_fetch_for_all_landlords(
+    background_tasks: BackgroundTasks,
     property_count_per_landlord: int = 10,
+    force: bool = False,
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
     """
-    为所有房东批量获取房源
+    为所有房东批量获取房源（后台任务）
+    
+    Returns 202 with a job id straight away; the batch runs in the background
+    and its progress and final result are read from GET /admin/jobs/{job_id}.
+    Landlords whose newest property is younger than REFRESH_HOURS are skipped
+    unless force=true.
     
     使用方法:
     curl -X POST "http://localhost:8000/api/v1/admin/fetch-all-landlords?property_count_per_landlord=15" \
       -H "X-Admin-Key: your-admin-secret"
     """
     
-    # 获取所有房东
-    landlords = db.query(LandlordProfile).all()
+    # 获取需要刷新的房东（最近 REFRESH_HOURS 内没有新房源的），force 时获取全部
+    query = select(LandlordProfile.id)
+    if not force:
+        latest = select(
+            Property.landlord_id,
+            func.max(Property.created_at).label("last_fetched")
+        ).group_by(Property.landlord_id).subquery()
+        cutoff = datetime.utcnow() - timedelta(hours=REFRESH_HOURS)
+        query = query.outerjoin(
+            latest, latest.c.landlord_id == LandlordProfile.id
+        ).where(
+            or_(latest.c.last_fetched.is_(None), latest.c.last_fetched < cutoff)
+        )
+    landlord_ids = await run_in_threadpool(lambda: list(db.execute(query).scalars()))
     
-    if not landlords:
+    if not landlord_ids:
         raise HTTPException(
             status_code=404, 
-            detail="No landlords found in the system"
+            detail="No landlords found in the system" if force
+            else f"No landlords need a refresh (fetched within {REFRESH_HOURS}h); use force=true"
         )
     
     # 检查API密钥
-    api_key = os.getenv("RAPIDAPI_KEY")
+    api_key = _RAPIDAPI_KEY
     if not api_key:
         raise HTTPException(
             status_code=500,
@@ -222,64 +569,31 @@ async def admin_fetch_for_all_landlords(
     if property_count_per_landlord > 30:
         property_count_per_landlord = 30
     
-    results = []
-    total_saved = 0
-    total_api_calls = 0
-    successful_count = 0
-    failed_count = 0
-    
-    fetcher = RapidAPIFetcher(api_key)
-    
-    for landlord in landlords:
-        try:
-            result = fetcher.get_real_properties(
-                db=db,
-                landlord_id=landlord.id,
-                limit=property_count_per_landlord
-            )
-            
-            if result['success']:
-                successful_count += 1
-                saved_count = result.get('saved_count', 0)
-                total_saved += saved_count
-                total_api_calls += result.get('api_calls_used', 1)
-                
-                results.append({
-                    "landlord_id": landlord.id,
-                    "success": True,
-                    "saved_count": saved_count,
-                    "total_fetched": result.get('total_fetched', 0),
-                    "message": f"Successfully processed {saved_count} properties"
-                })
-            else:
-                failed_count += 1
-                results.append({
-                    "landlord_id": landlord.id,
-                    "success": False,
-                    "saved_count": 0,
-                    "error": result.get('error', 'Unknown error')
-                })
-                
-        except Exception as e:
-            failed_count += 1
-            results.append({
-                "landlord_id": landlord.id,
-                "success": False,
-                "saved_count": 0,
-                "error": str(e)
-            })
-    
-    return BatchFetchResponse(
-        total_landlords=len(landlords),
-        total_properties_saved=total_saved,
-        total_api_calls_used=total_api_calls,
-        successful_landlords=successful_count,
-        failed_landlords=failed_count,
-        results=results
+    job = _new_job(total=len(landlord_ids))
+    background_tasks.add_task(
+        _run_batch_fetch, job, _get_fetcher("rapidapi", api_key), landlord_ids, property_count_per_landlord
     )
+    return _job_accepted(job)
+
+@router.get("/admin/jobs/{job_id}")
+def get_batch_job(
+    job_id: str,
+    admin_verified: bool = Depends(verify_admin_key)
+):
+    """
+    查询批量获取任务的进度和结果
+    
+    使用方法:
+    curl -X GET "http://localhost:8000/api/v1/admin/jobs/<job_id>" \
+      -H "X-Admin-Key: your-admin-secret"
+    """
+    job = _batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
 
 @router.delete("/admin/cleanup-properties/{landlord_id}")
-async def admin_cleanup_properties(
+def admin_cleanup_properties(
     landlord_id: int,
     older_than_days: int = 30,
     admin_verified: bool = Depends(verify_admin_key),
@@ -293,15 +607,12 @@ async def admin_cleanup_properties(
       -H "X-Admin-Key: your-admin-secret"
     """
     
-    from app.models import Property
-    from datetime import datetime, timedelta
-    
     # 检查房东是否存在
-    landlord = db.query(LandlordProfile).filter(
-        LandlordProfile.id == landlord_id
-    ).first()
+    landlord_exists = db.execute(
+        select(exists().where(LandlordProfile.id == landlord_id))
+    ).scalar()
     
-    if not landlord:
+    if not landlord_exists:
         raise HTTPException(
             status_code=404,
             detail=f"Landlord with ID {landlord_id} not found"
@@ -310,20 +621,23 @@ async def admin_cleanup_properties(
     # 计算截止日期
     cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
     
-    # 查找要清理的房源
-    old_properties = db.query(Property).filter(
-        Property.landlord_id == landlord_id,
-        Property.created_at < cutoff_date,
-        Property.is_active == True
-    ).all()
-    
-    # 标记为非活跃而不是删除
-    cleanup_count = 0
-    for prop in old_properties:
-        prop.is_active = False
-        cleanup_count += 1
+    # 标记为非活跃而不是删除，一条UPDATE完成
+    result = db.execute(
+        update(Property)
+        .where(
+            Property.landlord_id == landlord_id,
+            Property.created_at < cutoff_date,
+            Property.is_active == True
+        )
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    cleanup_count = result.rowcount
     
     db.commit()
+    invalidate_admin_cache()
+    # Core 批量写绕过了 flush 钩子，推荐缓存需手动清空
+    invalidate_recommendations()
     
     return {
         "success": True,
@@ -334,14 +648,14 @@ async def admin_cleanup_properties(
     }
 
 @router.post("/admin/fetch-real-properties")
-async def admin_fetch_real_properties_with_landlords(
+def admin_fetch_real_properties_with_landlords(
     property_count: int = 20,
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
     """获取真实房源并自动创建对应的真实房东"""
     
-    api_key = os.getenv("RAPIDAPI_KEY")
+    api_key = _RAPIDAPI_KEY
     if not api_key:
         raise HTTPException(status_code=500, detail="RapidAPI key not configured")
     
@@ -349,8 +663,9 @@ async def admin_fetch_real_properties_with_landlords(
         property_count = 50
     
     try:
-        fetcher = Realtor16Fetcher(api_key)
+        fetcher = _get_fetcher("realtor16", api_key)
         result = fetcher.get_real_properties_with_landlords(db=db, limit=property_count)
+        invalidate_admin_cache()
         
         return {
             "success": result['success'],
@@ -366,30 +681,47 @@ async def admin_fetch_real_properties_with_landlords(
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @router.get("/admin/real-landlords")
-async def list_real_landlords(
+def list_real_landlords(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
     """
-    列出所有通过API自动创建的真实房东
+    列出通过API自动创建的真实房东（按ID分页，下一页传入上次返回的 next_cursor）
     
     使用方法:
-    curl -X GET "http://3.145.189.113:8000/api/v1/admin/real-landlords" \
+    curl -X GET "http://3.145.189.113:8000/api/v1/admin/real-landlords?limit=100" \
       -H "X-Admin-Key: Admin123456"
     """
     
+    cache_key = ("admin:real_landlords", limit, cursor)
+    cached = _admin_cache.get(cache_key)
+    if cached is not None:
+        return _etag_response(cached, if_none_match)
+    
     # 查询所有验证状态为True的房东（表示来自真实API）
-    real_landlords = db.query(LandlordProfile).filter(
+    query = db.query(
+        LandlordProfile, func.count(Property.id)
+    ).outerjoin(
+        Property, Property.landlord_id == LandlordProfile.id
+    ).filter(
         LandlordProfile.verification_status == True
-    ).all()
+    )
+    if cursor is not None:
+        query = query.filter(LandlordProfile.id > cursor)
+    real_landlords = query.group_by(LandlordProfile.id).order_by(LandlordProfile.id).limit(limit).all()
+    
+    total_real_landlords = _admin_cache.get("admin:real_landlords:total")
+    if total_real_landlords is None:
+        total_real_landlords = db.query(func.count(LandlordProfile.id)).filter(
+            LandlordProfile.verification_status.is_(True)
+        ).scalar()
+        _admin_cache.set("admin:real_landlords:total", total_real_landlords, ttl=20)
     
     landlords_info = []
-    for landlord in real_landlords:
-        # 统计房源数量
-        property_count = db.query(Property).filter(
-            Property.landlord_id == landlord.id
-        ).count()
-        
+    for landlord, property_count in real_landlords:
         landlords_info.append({
             "id": landlord.id,
             "company_name": landlord.company_name,
@@ -399,17 +731,20 @@ async def list_real_landlords(
             "is_real_landlord": True
         })
     
-    return {
-        "total_real_landlords": len(real_landlords),
-        "landlords": landlords_info
+    response = {
+        "total_real_landlords": total_real_landlords,
+        "landlords": landlords_info,
+        "next_cursor": landlords_info[-1]["id"] if len(real_landlords) == limit else None
     }
+    _admin_cache.set(cache_key, response, ttl=20)
+    return _etag_response(response, if_none_match)
     
 
 @router.post("/admin/fetch-multi-source-properties")
-async def admin_fetch_multi_source_properties(
+def admin_fetch_multi_source_properties(
+    background_tasks: BackgroundTasks,
     property_count: int = 30,
-    admin_verified: bool = Depends(verify_admin_key),
-    db: Session = Depends(get_db)
+    admin_verified: bool = Depends(verify_admin_key)
 ):
     """
     Fetch comprehensive property data from multiple real estate APIs
@@ -419,12 +754,14 @@ async def admin_fetch_multi_source_properties(
     - Realty Mole API (secondary source) 
     - Custom Pittsburgh neighborhood data (tertiary source)
     
+    Runs in the background: returns 202 with a job id, poll GET /admin/jobs/{job_id}.
+    
     Usage:
     curl -X POST "http://3.145.189.113:8000/api/v1/admin/fetch-multi-source-properties?property_count=10" \
       -H "X-Admin-Key: Admin123456"
     """
     
-    api_key = os.getenv("RAPIDAPI_KEY")
+    api_key = _RAPIDAPI_KEY
     if not api_key:
         raise HTTPException(
             status_code=500,
@@ -434,12 +771,21 @@ async def admin_fetch_multi_source_properties(
     if property_count > 100:
         property_count = 100
     
+    job = _new_job()
+    background_tasks.add_task(_run_multi_source_fetch, job, api_key, property_count)
+    return _job_accepted(job)
+
+def _run_multi_source_fetch(job: dict, api_key: str, property_count: int):
+    """后台执行多数据源获取（同步函数，由线程池运行）"""
+    job["status"] = "running"
+    db = SessionLocal()
     try:
         fetcher = MultiSourceFetcher(api_key)
         result = fetcher.get_comprehensive_property_data(db=db, limit=property_count)
+        invalidate_admin_cache()
         
         if result['success']:
-            return {
+            job["result"] = {
                 "success": True,
                 "total_fetched": result.get('total_fetched', 0),
                 "saved_count": result.get('saved_count', 0),
@@ -449,20 +795,20 @@ async def admin_fetch_multi_source_properties(
                 "errors": result.get('errors', []),
                 "message": f"Successfully fetched {result.get('saved_count', 0)} properties from {len(result.get('api_sources_used', []))} different sources"
             }
+            job["status"] = "completed"
         else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to fetch properties: {result.get('errors', ['Unknown error'])}"
-            )
+            job["status"] = "failed"
+            job["error"] = f"Failed to fetch properties: {result.get('errors', ['Unknown error'])}"
             
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error during multi-source fetch: {str(e)}"
-        )
+        job["status"] = "failed"
+        job["error"] = f"Error during multi-source fetch: {str(e)}"
+    finally:
+        job["done"] = 1
+        db.close()
 
 @router.get("/admin/property-sources")
-async def get_property_sources_stats(
+def get_property_sources_stats(
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
@@ -474,69 +820,84 @@ async def get_property_sources_stats(
       -H "X-Admin-Key: Admin123456"
     """
     
+    cached = _admin_cache.get("admin:property_sources")
+    if cached is not None:
+        return cached
+    
     try:
-        # Count properties by source (based on description patterns)
-        all_properties = db.query(Property).filter(Property.is_active == True).all()
+        active = Property.is_active == True
         
-        source_stats = {
-            'realtor16': 0,
-            'realty_mole': 0,
-            'custom_pittsburgh': 0,
-            'other': 0
-        }
+        # Source (based on description patterns), first match wins
+        desc = func.lower(Property.description)
+        source = case(
+            (or_(desc.contains('realtor16'), desc.contains('realtor.com')), 'realtor16'),
+            (or_(desc.contains('realty mole'), desc.contains('realty-mole')), 'realty_mole'),
+            (and_(
+                desc.contains('pittsburgh'),
+                or_(desc.contains('neighborhood'), desc.contains('property management'))
+            ), 'custom_pittsburgh'),
+            else_='other'
+        ).label('source')
+        
+        # Neighborhood: first one named in the address
+        neighborhood = case(
+            *[(Property.address.contains(name), name) for name in PITTSBURGH_NEIGHBORHOODS],
+            else_=None
+        ).label('neighborhood')
+        
+        price_range = case(
+            (Property.price < 1000, 'under_1000'),
+            (Property.price < 1500, '1000_1500'),
+            (Property.price < 2000, '1500_2000'),
+            else_='over_2000'
+        ).label('price_range')
+        
+        property_type = func.coalesce(Property.property_type, 'unknown').label('property_type')
+        
+        def _grouped(column):
+            return dict(
+                db.query(column, func.count(Property.id)).filter(active).group_by(column).all()
+            )
+        
+        source_stats = {'realtor16': 0, 'realty_mole': 0, 'custom_pittsburgh': 0, 'other': 0}
+        source_stats.update(_grouped(source))
+        
+        neighborhood_stats = _grouped(neighborhood)
+        neighborhood_stats.pop(None, None)
         
-        neighborhood_stats = {}
         price_ranges = {'under_1000': 0, '1000_1500': 0, '1500_2000': 0, 'over_2000': 0}
-        property_types = {}
+        price_ranges.update(_grouped(price_range))
         
-        for prop in all_properties:
-            # Categorize by source
-            desc = prop.description.lower() if prop.description else ''
-            if 'realtor16' in desc or 'realtor.com' in desc:
-                source_stats['realtor16'] += 1
-            elif 'realty mole' in desc or 'realty-mole' in desc:
-                source_stats['realty_mole'] += 1
-            elif 'pittsburgh' in desc and ('neighborhood' in desc or 'property management' in desc):
-                source_stats['custom_pittsburgh'] += 1
-            else:
-                source_stats['other'] += 1
-            
-            # Neighborhood stats
-            if prop.address:
-                for neighborhood in ['Oakland', 'Shadyside', 'Squirrel Hill', 'Greenfield', 
-                                   'Point Breeze', 'Regent Square', 'Bloomfield', 'Friendship']:
-                    if neighborhood in prop.address:
-                        neighborhood_stats[neighborhood] = neighborhood_stats.get(neighborhood, 0) + 1
-                        break
-            
-            # Price ranges
-            if prop.price < 1000:
-                price_ranges['under_1000'] += 1
-            elif prop.price < 1500:
-                price_ranges['1000_1500'] += 1
-            elif prop.price < 2000:
-                price_ranges['1500_2000'] += 1
-            else:
-                price_ranges['over_2000'] += 1
-                
-            # Property types
-            prop_type = prop.property_type or 'unknown'
-            property_types[prop_type] = property_types.get(prop_type, 0) + 1
+        property_types = _grouped(property_type)
         
-        return {
-            "total_active_properties": len(all_properties),
+        # Data quality metrics in one aggregate row (count(...) FILTER (WHERE ...))
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        total, with_coordinates, with_photos, average_price, created_today = db.query(
+            func.count(Property.id),
+            func.count(Property.id).filter(and_(Property.latitude != 0, Property.longitude != 0)),
+            func.count(Property.id).filter(Property.image_url != ''),
+            func.avg(Property.price),
+            func.count(Property.id).filter(and_(
+                Property.created_at >= today,
+                Property.created_at < today + timedelta(days=1)
+            ))
+        ).filter(active).one()
+        
+        response = {
+            "total_active_properties": total,
             "source_breakdown": source_stats,
             "neighborhood_distribution": neighborhood_stats,
             "price_range_distribution": price_ranges,
             "property_type_distribution": property_types,
             "data_quality_metrics": {
-                "properties_with_coordinates": len([p for p in all_properties if p.latitude and p.longitude]),
-                "properties_with_photos": len([p for p in all_properties if p.image_url]),
-                "average_price": sum(p.price for p in all_properties) / len(all_properties) if all_properties else 0,
-                "properties_created_today": len([p for p in all_properties if p.created_at and 
-                                               p.created_at.date() == datetime.now().date()])
+                "properties_with_coordinates": with_coordinates,
+                "properties_with_photos": with_photos,
+                "average_price": float(average_price) if average_price is not None else 0,
+                "properties_created_today": created_today
             }
         }
+        _admin_cache.set("admin:property_sources", response, ttl=30)
+        return response
         
     except Exception as e:
         raise HTTPException(
@@ -545,7 +906,7 @@ async def get_property_sources_stats(
         )
 
 @router.delete("/admin/reset-database")
-async def reset_database(
+def reset_database(
     confirm: str = "RESET_ALL_DATA",
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
@@ -559,31 +920,54 @@ async def reset_database(
         )
     
     try:
-        # 使用text()包装所有SQL语句
-        
-        # 1. 删除关联表数据
-        db.execute(text("DELETE FROM property_preferences"))
-        db.execute(text("DELETE FROM roommate_preferences"))
-        
-        # 2. 删除房源相关数据
-        db.execute(text("DELETE FROM property_images"))
-        db.execute(text("DELETE FROM comments"))
-        db.execute(text("DELETE FROM interactions"))
-        db.execute(text("DELETE FROM messages"))
-        db.execute(text("DELETE FROM user_preferences"))
-        
-        # 3. 删除房源
-        properties_deleted = db.query(Property).delete()
+        if db.bind.dialect.name == "postgresql":
+            # TRUNCATE 不返回行数，先统计
+            properties_deleted = db.query(func.count(Property.id)).scalar()
+            landlords_deleted = db.query(func.count(LandlordProfile.id)).scalar()
+            
+            # 1-4. 一条TRUNCATE清空关联表、房源和房东资料
+            db.execute(text("""
+                TRUNCATE property_preferences, roommate_preferences,
+                         property_images, property_embeddings, comments,
+                         interactions, messages, user_preferences,
+                         properties, landlord_profiles
+            """))
+        else:
+            # 使用text()包装所有SQL语句
+            
+            # 1. 删除关联表数据
+            db.execute(text("DELETE FROM property_preferences"))
+            db.execute(text("DELETE FROM roommate_preferences"))
+            
+            # 2. 删除房源相关数据
+            db.execute(text("DELETE FROM property_images"))
+            db.execute(text("DELETE FROM comments"))
+            db.execute(text("DELETE FROM interactions"))
+            db.execute(text("DELETE FROM messages"))
+            db.execute(text("DELETE FROM user_preferences"))
+            
+            # 3. 删除房源
+            properties_deleted = db.query(Property).delete(synchronize_session=False)
+            
+            # 4. 删除房东资料
+            landlords_deleted = db.query(LandlordProfile).delete(synchronize_session=False)
         
-        # 4. 删除房东资料
-        landlords_deleted = db.query(LandlordProfile).delete()
+        # user_preferences 已清空；原生 SQL 不触发 after_flush 同步，
+        # 在同一事务里清空租客的 preferences_json，推荐不再使用旧偏好
+        db.execute(
+            update(TenantProfile)
+            .values(preferences_json={})
+            .execution_options(synchronize_session=False)
+        )
         
-        # 5. 删除自动生成的用户
+        # 5. 删除自动生成的用户 (走 ix_users_realtor16_auto 部分索引)
         auto_users_deleted = db.query(User).filter(
             User.email.like('%realtor16.auto%')
         ).delete(synchronize_session=False)
         
         db.commit()
+        invalidate_admin_cache()
+        invalidate_recommendations()
         
         return {
             "success": True,
@@ -601,7 +985,7 @@ async def reset_database(
         )
 
 @router.get("/admin/sync/status")
-async def get_sync_scheduler_status(
+def get_sync_scheduler_status(
     admin_verified: bool = Depends(verify_admin_key)
 ):
     """
@@ -616,7 +1000,7 @@ async def get_sync_scheduler_status(
         status = get_scheduler_status()
         return {
             "scheduler_status": status,
-            "api_configured": bool(os.getenv("RAPIDAPI_KEY")),
+            "api_configured": bool(_RAPIDAPI_KEY),
             "last_check": datetime.now().isoformat()
         }
     except Exception as e:
@@ -626,7 +1010,7 @@ async def get_sync_scheduler_status(
         )
 
 @router.post("/admin/sync/start")
-async def start_sync_scheduler(
+def start_sync_scheduler(
     admin_verified: bool = Depends(verify_admin_key)
 ):
     """
@@ -651,7 +1035,7 @@ async def start_sync_scheduler(
         )
 
 @router.post("/admin/sync/stop")
-async def stop_sync_scheduler(
+def stop_sync_scheduler(
     admin_verified: bool = Depends(verify_admin_key)
 ):
     """
@@ -675,7 +1059,8 @@ async def stop_sync_scheduler(
         )
 
 @router.post("/admin/sync/manual")
-async def trigger_manual_sync(
+def trigger_manual_sync(
+    background_tasks: BackgroundTasks,
     sync_type: str = "incremental",  # incremental, comprehensive, cleanup
     admin_verified: bool = Depends(verify_admin_key)
 ):
@@ -687,6 +1072,8 @@ async def trigger_manual_sync(
     - comprehensive: Full sync from all sources  
     - cleanup: Remove old inactive properties
     
+    Runs in the background: returns 202 with a job id, poll GET /admin/jobs/{job_id}.
+    
     Usage:
     curl -X POST "http://3.145.189.113:8000/api/v1/admin/sync/manual?sync_type=comprehensive" \
       -H "X-Admin-Key: Admin123456"
@@ -698,48 +1085,97 @@ async def trigger_manual_sync(
             detail="sync_type must be one of: incremental, comprehensive, cleanup"
         )
     
+    job = _new_job()
+    background_tasks.add_task(_run_manual_sync, job, sync_type)
+    return _job_accepted(job)
+
+def _run_manual_sync(job: dict, sync_type: str):
+    """后台执行手动同步（同步函数，由线程池运行）"""
+    job["status"] = "running"
     try:
-        result = manual_sync(sync_type)
-        return result
+        job["result"] = manual_sync(sync_type)
+        job["status"] = "completed"
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error during manual sync: {str(e)}"
-        )
+        job["status"] = "failed"
+        job["error"] = f"Error during manual sync: {str(e)}"
+    finally:
+        job["done"] = 1
+        invalidate_admin_cache()
 
 @router.get("/admin/property-links")
-async def get_property_links_report(
+def get_property_links_report(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
     """
     Get detailed report of property links and data sources
     
+    Statistics cover all active properties; properties_with_links is one page
+    (limit/offset, ordered by property id).
+    
     Usage:
-    curl -X GET "http://3.145.189.113:8000/api/v1/admin/property-links" \
+    curl -X GET "http://3.145.189.113:8000/api/v1/admin/property-links?limit=100&offset=0" \
       -H "X-Admin-Key: Admin123456"
     """
     
+    cache_key = ("admin:property_links", limit, offset)
+    cached = _admin_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Get all active properties with their landlords
-        properties_with_landlords = db.query(Property).join(LandlordProfile).filter(
+        # Link markers as SQL conditions over the lowercased descriptions
+        desc = func.lower(Property.description)
+        landlord_desc = func.lower(LandlordProfile.description)
+        marker_conditions = {
+            stat_key: or_(*[desc.contains(needle) for needle in needles])
+            for needles, _, stat_key in LINK_MARKERS
+        }
+        office_website = or_(landlord_desc.contains('website:'), landlord_desc.contains('http'))
+        any_link = or_(*marker_conditions.values(), office_website)
+        
+        # Active properties with their landlords
+        active_with_landlord = db.query(Property).join(Property.landlord).filter(
             Property.is_active == True
-        ).all()
+        )
         
-        link_report = {
-            "total_properties": len(properties_with_landlords),
-            "properties_with_links": [],
-            "landlord_link_summary": {},
-            "link_statistics": {
-                "realtor_com_links": 0,
-                "zillow_links": 0,
-                "apartments_com_links": 0,
-                "mls_ids": 0,
-                "office_websites": 0
-            }
-        }
+        # All counters in one aggregate row
+        counts = active_with_landlord.with_entities(
+            func.count(Property.id),
+            func.count(case((any_link, 1))),
+            func.count(case((office_website, 1))),
+            *[func.count(case((condition, 1))) for condition in marker_conditions.values()]
+        ).one()
+        total, with_links, office_websites = counts[:3]
+        link_statistics = dict(zip(marker_conditions, counts[3:]))
+        link_statistics["office_websites"] = office_websites
         
-        for prop in properties_with_landlords:
+        # Landlords with office websites and their active property counts
+        landlord_link_summary = {}
+        for company, description, contact_phone, property_count in active_with_landlord.filter(
+            office_website
+        ).with_entities(
+            LandlordProfile.company_name,
+            LandlordProfile.description,
+            LandlordProfile.contact_phone,
+            func.count(Property.id)
+        ).group_by(LandlordProfile.id).order_by(LandlordProfile.id):
+            summary = landlord_link_summary.setdefault(company, {
+                "description": description,
+                "contact_phone": contact_phone,
+                "property_count": 0
+            })
+            summary["property_count"] += property_count
+        
+        # One page of properties with links; contains_eager fills prop.landlord from the join
+        page = active_with_landlord.options(contains_eager(Property.landlord)).filter(
+            any_link
+        ).order_by(Property.id).offset(offset).limit(limit).all()
+        
+        properties_with_links = []
+        for prop in page:
             property_info = {
                 "property_id": prop.id,
                 "title": prop.title,
@@ -751,54 +1187,38 @@ async def get_property_links_report(
             
             # Check property description for links
             if prop.description:
-                desc = prop.description.lower()
-                
-                # Count different types of links
-                if 'realtor.com' in desc or 'realtor16' in desc:
-                    property_info["links_found"].append("Realtor.com")
-                    link_report["link_statistics"]["realtor_com_links"] += 1
-                
-                if 'zillow.com' in desc:
-                    property_info["links_found"].append("Zillow")
-                    link_report["link_statistics"]["zillow_links"] += 1
-                    
-                if 'apartments.com' in desc:
-                    property_info["links_found"].append("Apartments.com") 
-                    link_report["link_statistics"]["apartments_com_links"] += 1
-                    
-                if 'mls id:' in desc:
-                    property_info["links_found"].append("MLS ID")
-                    link_report["link_statistics"]["mls_ids"] += 1
+                found = {match.lastgroup for match in _LINK_PATTERN.finditer(prop.description.lower())}
+                for _, label, stat_key in LINK_MARKERS:
+                    if stat_key in found:
+                        property_info["links_found"].append(label)
             
             # Check landlord description for office websites
             if prop.landlord and prop.landlord.description:
-                landlord_desc = prop.landlord.description.lower()
-                if 'website:' in landlord_desc or 'http' in landlord_desc:
+                landlord_text = prop.landlord.description.lower()
+                if 'website:' in landlord_text or 'http' in landlord_text:
                     property_info["links_found"].append("Landlord Website")
-                    link_report["link_statistics"]["office_websites"] += 1
-                    
-                    # Add to landlord summary
-                    company = prop.landlord.company_name
-                    if company not in link_report["landlord_link_summary"]:
-                        link_report["landlord_link_summary"][company] = {
-                            "description": prop.landlord.description,
-                            "contact_phone": prop.landlord.contact_phone,
-                            "property_count": 0
-                        }
-                    link_report["landlord_link_summary"][company]["property_count"] += 1
             
-            # Only include properties with links
-            if property_info["links_found"]:
-                link_report["properties_with_links"].append(property_info)
+            properties_with_links.append(property_info)
         
-        # Calculate percentages
-        total = len(properties_with_landlords)
-        link_report["coverage_stats"] = {
-            "properties_with_any_links": len(link_report["properties_with_links"]),
-            "coverage_percentage": round((len(link_report["properties_with_links"]) / total * 100), 2) if total > 0 else 0,
-            "realtor_coverage": round((link_report["link_statistics"]["realtor_com_links"] / total * 100), 2) if total > 0 else 0
+        link_report = {
+            "total_properties": total,
+            "properties_with_links": properties_with_links,
+            "landlord_link_summary": landlord_link_summary,
+            "link_statistics": link_statistics,
+            # Calculate percentages
+            "coverage_stats": {
+                "properties_with_any_links": with_links,
+                "coverage_percentage": round((with_links / total * 100), 2) if total > 0 else 0,
+                "realtor_coverage": round((link_statistics["realtor_com_links"] / total * 100), 2) if total > 0 else 0
+            },
+            "pagination": {
+                "limit": limit,
+                "offset": offset,
+                "next_offset": offset + limit if offset + limit < with_links else None
+            }
         }
         
+        _admin_cache.set(cache_key, link_report, ttl=30)
         return link_report
         
     except Exception as e:
@@ -807,9 +1227,10 @@ async def get_property_links_report(
             detail=f"Error generating links report: {str(e)}"
         )
 
-@router.get("/admin/property-details/{property_id}")
-async def get_property_details(
+@router.get("/admin/property-details/{property_id}", responses={200: {"model": AdminPropertyDetailsResponse}})
+def get_property_details(
     property_id: int,
+    if_none_match: Optional[str] = Header(None),
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
@@ -822,41 +1243,21 @@ async def get_property_details(
     """
     
     try:
-        property_details = db.query(Property).filter(Property.id == property_id).first()
+        # Property and its landlord in one query
+        row = db.query(Property, LandlordProfile).outerjoin(
+            LandlordProfile, LandlordProfile.id == Property.landlord_id
+        ).filter(Property.id == property_id).first()
         
-        if not property_details:
+        if not row:
             raise HTTPException(status_code=404, detail="Property not found")
         
-        # Get landlord details
-        landlord = db.query(LandlordProfile).filter(
-            LandlordProfile.id == property_details.landlord_id
-        ).first()
+        property_details, landlord = row
         
-        return {
-            "property": {
-                "id": property_details.id,
-                "title": property_details.title,
-                "price": property_details.price,
-                "description": property_details.description,
-                "address": property_details.address,
-                "property_type": property_details.property_type,
-                "bedrooms": property_details.bedrooms,
-                "bathrooms": property_details.bathrooms,
-                "area": property_details.area,
-                "latitude": property_details.latitude,
-                "longitude": property_details.longitude,
-                "created_at": property_details.created_at.isoformat() if property_details.created_at else None,
-                "is_active": property_details.is_active
-            },
-            "landlord": {
-                "id": landlord.id if landlord else None,
-                "company_name": landlord.company_name if landlord else None,
-                "contact_phone": landlord.contact_phone if landlord else None,
-                "description": landlord.description if landlord else None,
-                "verification_status": landlord.verification_status if landlord else None,
-                "created_at": landlord.created_at.isoformat() if landlord and landlord.created_at else None
-            }
-        }
+        details = AdminPropertyDetailsResponse(
+            property=AdminPropertyDetail.model_validate(property_details),
+            landlord=AdminLandlordDetail.model_validate(landlord) if landlord else AdminLandlordDetail()
+        )
+        return _etag_response(details.model_dump(mode="json"), if_none_match)
         
     except HTTPException:
         raise
@@ -866,8 +1267,15 @@ async def get_property_details(
             detail=f"Error getting property details: {str(e)}"
         )
 
+IMAGE_INSERT_BATCH = 1000
+
+def _bulk_insert_images(db: Session, rows: List[dict]):
+    """按批次用多值 INSERT 写入 PropertyImage 行"""
+    for start in range(0, len(rows), IMAGE_INSERT_BATCH):
+        db.bulk_insert_mappings(PropertyImage, rows[start:start + IMAGE_INSERT_BATCH])
+
 @router.post("/admin/migrate-images")
-async def migrate_api_images_to_property_images(
+def migrate_api_images_to_property_images(
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
 ):
@@ -883,40 +1291,45 @@ async def migrate_api_images_to_property_images(
     """
     
     try:
-        import json
-        
         print("Starting API images migration...")
         
-        # Get all properties with api_images
-        properties_with_images = db.query(Property).filter(
-            Property.api_images.is_not(None),
-            Property.api_images != "[]",
-            Property.api_images != ""
-        ).all()
-        
-        if not properties_with_images:
-            return {
-                "success": True,
-                "message": "No properties with API images found",
-                "migrated_properties": 0,
-                "total_images_created": 0,
-                "skipped_properties": 0,
-                "errors": []
-            }
-        
         migrated_count = 0
         skipped_count = 0
         total_images = 0
         errors = []
         
+        if db.bind.dialect.name == "postgresql":
+            # JSON 数组形式的 api_images 用一条 INSERT ... SELECT 迁移
+            migrated_count, total_images, skipped_count = db.execute(MIGRATE_API_IMAGES_SQL).one()
+            # 以字符串保存的 JSON 数组仍由下面的循环处理
+            api_images_filter = func.json_typeof(Property.api_images) == 'string'
+        else:
+            # Get all properties with api_images
+            api_images_filter = and_(
+                Property.api_images.is_not(None),
+                Property.api_images != "[]",
+                Property.api_images != ""
+            )
+        
+        # 只加载用到的列，服务端游标分批读取，内存占用与房源数量无关
+        properties_with_images = db.query(Property).options(
+            load_only(Property.id, Property.api_images, Property.image_url)
+        ).filter(api_images_filter).execution_options(stream_results=True).yield_per(500)
+        
+        # 收集所有图片行，最后分批批量插入，避免逐行 INSERT
+        now = datetime.utcnow()
+        image_rows = []
+        image_url_updates = []
+        
+        # 已有图片的房源ID，一次查出
+        existing_ids = {pid for (pid,) in db.query(PropertyImage.property_id).distinct()}
+        
+        seen = 0
         for prop in properties_with_images:
+            seen += 1
             try:
                 # Check if images already exist for this property
-                existing_images = db.query(PropertyImage).filter(
-                    PropertyImage.property_id == prop.id
-                ).count()
-                
-                if existing_images > 0:
+                if prop.id in existing_ids:
                     skipped_count += 1
                     continue
                 
@@ -924,8 +1337,8 @@ async def migrate_api_images_to_property_images(
                 api_images = prop.api_images
                 if isinstance(api_images, str):
                     try:
-                        api_images = json.loads(api_images)
-                    except json.JSONDecodeError:
+                        api_images = orjson.loads(api_images)
+                    except orjson.JSONDecodeError:
                         errors.append(f"Property {prop.id}: Invalid JSON in api_images")
                         continue
                 
@@ -938,31 +1351,40 @@ async def migrate_api_images_to_property_images(
                     if not image_url or not isinstance(image_url, str):
                         continue
                         
-                    # Create PropertyImage record
-                    property_image = PropertyImage(
-                        property_id=prop.id,
-                        image_url=image_url,
-                        is_primary=(i == 0),  # First image is primary
-                        labels=None,
-                        created_at=datetime.utcnow()
-                    )
-                    
-                    db.add(property_image)
+                    image_rows.append({
+                        "property_id": prop.id,
+                        "image_url": image_url,
+                        "is_primary": i == 0,  # First image is primary
+                        "labels": None,
+                        "created_at": now
+                    })
                     images_created += 1
                     total_images += 1
                 
                 if images_created > 0:
                     # Update property's main image_url if it's null
                     if not prop.image_url:
-                        prop.image_url = api_images[0]
+                        image_url_updates.append({"id": prop.id, "image_url": api_images[0]})
                     
                     migrated_count += 1
                 
             except Exception as e:
                 errors.append(f"Property {prop.id}: {str(e)}")
-                db.rollback()
                 continue
         
+        if not seen and not (migrated_count or skipped_count):
+            return {
+                "success": True,
+                "message": "No properties with API images found",
+                "migrated_properties": 0,
+                "total_images_created": 0,
+                "skipped_properties": 0,
+                "errors": []
+            }
+        
+        _bulk_insert_images(db, image_rows)
+        db.bulk_update_mappings(Property, image_url_updates)
+        
         # Commit all changes
         if migrated_count > 0:
             db.commit()
@@ -979,56 +1401,55 @@ async def migrate_api_images_to_property_images(
                 "https://images.unsplash.com/photo-1519452465094-7d23f0b4a4b1?w=800&h=600&fit=crop&crop=entropy&cs=tinysrgb",  # Studio apartment
             ]
             
-            # Find properties without images
-            properties_without_images = db.query(Property).outerjoin(PropertyImage).filter(
-                PropertyImage.id.is_(None),
-                Property.is_active == True
-            ).all()
-            
-            for prop in properties_without_images:
-                # Choose fallback image based on property type
-                if prop.property_type == 'apartment':
-                    fallback_url = fallback_images[3]  # Apartment building
-                elif prop.property_type == 'studio':
-                    fallback_url = fallback_images[4]  # Studio
-                elif prop.property_type == 'house':
-                    fallback_url = fallback_images[0]  # Modern house
-                elif prop.property_type == 'condo':
-                    fallback_url = fallback_images[2]  # Contemporary house
-                else:
-                    fallback_url = fallback_images[1]  # Default beautiful home
-                
-                try:
-                    # Create fallback PropertyImage
-                    property_image = PropertyImage(
-                        property_id=prop.id,
-                        image_url=fallback_url,
-                        is_primary=True,
-                        labels=["fallback_image"],
-                        created_at=datetime.utcnow()
-                    )
-                    
-                    db.add(property_image)
-                    
-                    # Update property's main image_url if it's null
-                    if not prop.image_url:
-                        prop.image_url = fallback_url
-                    
-                    fallback_added += 1
-                    
-                except Exception as e:
-                    errors.append(f"Fallback for Property {prop.id}: {str(e)}")
+            # Choose fallback image based on property type
+            fallback_url = case(
+                {
+                    'apartment': fallback_images[3],  # Apartment building
+                    'studio': fallback_images[4],     # Studio
+                    'house': fallback_images[0],      # Modern house
+                    'condo': fallback_images[2],      # Contemporary house
+                },
+                value=Property.property_type,
+                else_=fallback_images[1]              # Default beautiful home
+            )
+            without_images = and_(
+                Property.is_active == True,
+                ~exists().where(PropertyImage.property_id == Property.id)
+            )
             
-            if fallback_added > 0:
-                db.commit()
+            # 先补主图 URL (依赖"尚无图片"条件)，再一次性插入兜底图片
+            db.execute(
+                update(Property)
+                .where(without_images, or_(Property.image_url.is_(None), Property.image_url == ''))
+                .values(image_url=fallback_url)
+                .execution_options(synchronize_session=False)
+            )
+            fallback_added = db.execute(
+                insert(PropertyImage).from_select(
+                    ["property_id", "image_url", "is_primary", "labels", "created_at"],
+                    select(
+                        Property.id,
+                        fallback_url,
+                        literal(True),
+                        literal(["fallback_image"], PropertyImage.labels.type),
+                        literal(now, PropertyImage.created_at.type)
+                    ).where(without_images)
+                )
+            ).rowcount
+            db.commit()
                 
         except Exception as e:
+            db.rollback()
             errors.append(f"Fallback images error: {str(e)}")
         
         # Verification
-        total_properties = db.query(Property).filter(Property.is_active == True).count()
-        properties_with_property_images = db.query(Property).join(PropertyImage).filter(Property.is_active == True).distinct().count()
-        total_property_images = db.query(PropertyImage).count()
+        total_properties = db.query(func.count(Property.id)).filter(Property.is_active == True).scalar()
+        properties_with_property_images = db.query(
+            func.count(distinct(PropertyImage.property_id))
+        ).join(Property).filter(Property.is_active == True).scalar()
+        total_property_images = db.query(func.count(PropertyImage.id)).scalar()
+        invalidate_admin_cache()
+        invalidate_recommendations()
         
         return {
             "success": True,
@@ -1054,7 +1475,7 @@ async def migrate_api_images_to_property_images(
         )
 
 @router.post("/admin/update-embeddings")
-async def update_property_embeddings(
+def update_property_embeddings(
     admin_verified: bool = Depends(verify_admin_key)
 ):
     """
@@ -1079,7 +1500,7 @@ async def update_property_embeddings(
         )
 
 @router.post("/admin/enrich-existing-properties")
-async def enrich_existing_properties(
+def enrich_existing_properties(
     batch_size: int = 10,
     admin_verified: bool = Depends(verify_admin_key),
     db: Session = Depends(get_db)
@@ -1094,9 +1515,6 @@ async def enrich_existing_properties(
     curl -X POST "http://3.145.189.113:8000/api/v1/admin/enrich-existing-properties?batch_size=10" \
       -H "X-Admin-Key: Admin123456"
     """
-    import time
-    from app.services.property_enrichment import get_enrichment_service
-
     try:
         # Find properties without AI enrichment
         unenriched = db.query(Property).filter(
@@ -1104,10 +1522,10 @@ async def enrich_existing_properties(
             ~Property.extended_description.like('%Key Features:%')
         ).limit(batch_size * 2).all()
 
-        total_unenriched = db.query(Property).filter(
+        total_unenriched = db.query(func.count(Property.id)).filter(
             Property.is_active == True,
             ~Property.extended_description.like('%Key Features:%')
-        ).count()
+        ).scalar()
 
         if not unenriched:
             return {
@@ -1177,6 +1595,9 @@ async def enrich_existing_properties(
                 skipped_count += 1
                 continue
 
+        if enriched_count:
+            invalidate_admin_cache()
+
         return {
             "success": True,
             "message": f"Successfully enriched {enriched_count} properties",
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
@@ -48,11 +49,11 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 @router.post("/register", response_model=schemas.User)
 def register_user(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
     # 检查邮箱是否已注册
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+    db_user = db.execute(select(User).where(User.email == user_data.email)).scalar_one_or_none()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    # Create new user
+    # Create new user (sync handler: hashing and DB work run in the threadpool)
     hashed_password = get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
@@ -92,7 +93,7 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": str(user.id), "email": user.email}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -1,16 +1,18 @@
 # app/routes/chat.py
 from fastapi import APIRouter, Depends, Body, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 
 from app.database import get_db
 from app.auth import get_current_user
-from app.models import User, UserPreference
-from app.services.chat_service import ChatService
+from app.models import User, UserPreference, refresh_preferences_json
+from app.recommendations import invalidate_recommendations
+from app.services.chat_service import get_chat_service
 from app.schemas import ChatAIMessage, ChatAIResponse, ChatFullResponse, PreferenceOutput
 
 router = APIRouter()
-chat_service = ChatService()
+chat_service = get_chat_service()
 
 @router.post("/message", response_model=ChatAIResponse)
 async def chat_with_bot(
@@ -26,7 +28,7 @@ async def chat_with_bot(
     user_message = message_data.message
     
     # Use chat service to process message and extract preferences
-    result = chat_service.chat_with_ai(user_message)
+    result = await chat_service.chat_with_ai(user_message, user_id=current_user.id)
     
     # Create preference objects and save to database
     if result["preferences"]:
@@ -34,25 +36,9 @@ async def chat_with_bot(
             user_id=current_user.id,
             preferences=result["preferences"]
         )
-        
-        # Add preferences to database with upsert logic
-        for pref_obj in preference_objects:
-            # Check if preference already exists
-            existing_pref = db.query(UserPreference).filter(
-                UserPreference.user_id == pref_obj.user_id,
-                UserPreference.preference_key == pref_obj.preference_key,
-                UserPreference.preference_category == pref_obj.preference_category,
-                UserPreference.source == pref_obj.source
-            ).first()
-            
-            if existing_pref:
-                # Update existing preference
-                existing_pref.preference_value = pref_obj.preference_value
-                existing_pref.created_at = pref_obj.created_at
-            else:
-                # Add new preference
-                db.add(pref_obj)
-        db.commit()
+
+        # Add preferences to database with upsert logic (blocking DB I/O, off the event loop)
+        await run_in_threadpool(chat_service.save_preferences, db, preference_objects)
     
     return {"response": result["response"]}
 
@@ -70,50 +56,18 @@ async def chat_with_bot_full_response(
     user_message = message_data.message
     
     # Use chat service to process message and extract preferences
-    result = chat_service.chat_with_ai(user_message)
+    result = await chat_service.chat_with_ai(user_message, user_id=current_user.id)
     
     # Create preference objects and save to database
-    preference_objects = []
+    preferences_output = []
     if result["preferences"]:
         preference_objects = chat_service.create_preference_objects(
             user_id=current_user.id,
             preferences=result["preferences"]
         )
-        
-        # Add preferences to database with upsert logic
-        for pref_obj in preference_objects:
-            # Check if preference already exists
-            existing_pref = db.query(UserPreference).filter(
-                UserPreference.user_id == pref_obj.user_id,
-                UserPreference.preference_key == pref_obj.preference_key,
-                UserPreference.preference_category == pref_obj.preference_category,
-                UserPreference.source == pref_obj.source
-            ).first()
-            
-            if existing_pref:
-                # Update existing preference
-                existing_pref.preference_value = pref_obj.preference_value
-                existing_pref.created_at = pref_obj.created_at
-            else:
-                # Add new preference
-                db.add(pref_obj)
-        db.commit()
-        
-        # Refresh each preference object individually
-        for pref_obj in preference_objects:
-            if pref_obj in db:
-                db.refresh(pref_obj)
-    
-    # Format preferences for response
-    preferences_output = [
-        {
-            "key": pref.preference_key,
-            "value": pref.preference_value,
-            "category": pref.preference_category,
-            "created_at": pref.created_at
-        }
-        for pref in preference_objects
-    ]
+
+        # Upsert returns the stored rows, so nothing needs to be re-read
+        preferences_output = await run_in_threadpool(chat_service.save_preferences, db, preference_objects)
     
     return {
         "response": result["response"],
@@ -121,7 +75,7 @@ async def chat_with_bot_full_response(
     }
 
 @router.get("/preferences", response_model=List[PreferenceOutput])
-async def get_user_preferences(
+def get_user_preferences(
     category: Optional[str] = Query(None, description="Filter preferences by specific category"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -152,7 +106,7 @@ async def get_user_preferences(
     ]
 
 @router.delete("/preferences", status_code=204)
-async def clear_user_preferences(
+def clear_user_preferences(
     category: Optional[str] = Query(None, description="Filter preferences by specific category"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -170,6 +124,9 @@ async def clear_user_preferences(
     if category:
         query = query.filter(UserPreference.preference_category == category)
     
+    # Bulk delete skips the flush hooks, so refresh the derived state here
     query.delete()
+    refresh_preferences_json(db.connection(), [current_user.id])
     db.commit()
+    invalidate_recommendations()
     return None
\ No newline at end of file
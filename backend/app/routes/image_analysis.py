@@ -1,5 +1,6 @@
 # app/routes/image_analysis.py
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -46,14 +47,16 @@ async def analyze_image(
             detail="User type not recognized for image analysis"
         )
     
-    # Read image data
-    image_data = await file.read()
+    # Hand the spooled upload to the analyzer instead of buffering it into bytes
+    await file.seek(0)
+    image_data = file.file
     
-    # Perform analysis based on determined type
+    # Perform analysis based on determined type; the Gemini Vision call and image
+    # decoding are blocking, so they run in the threadpool
     if analysis_type == "tenant_preference":
-        analysis_result = image_service.analyze_tenant_preference_image(image_data)
+        analysis_result = await run_in_threadpool(image_service.analyze_tenant_preference_image, image_data)
     else:  # property_listing
-        analysis_result = image_service.analyze_property_listing_image(image_data)
+        analysis_result = await run_in_threadpool(image_service.analyze_property_listing_image, image_data)
     
     # Rest of your code remains the same
     if analysis_result["status"] == "error":
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status, Body, WebSocket,
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
-from jose import jwt, JWTError
+import jwt
+from jwt import PyJWTError
 
 from app.database import get_db
 from app.models import User, Message
@@ -24,7 +25,7 @@ async def send_message(
     Send a message to another user
     """
     # Check if receiver exists
-    receiver = db.query(User).filter(User.id == message.receiver_id).first()
+    receiver = db.get(User, message.receiver_id)
     if not receiver:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,7 +69,7 @@ def get_messages(
     Get conversation history with another user
     """
     # Check if other user exists
-    other_user = db.query(User).filter(User.id == other_user_id).first()
+    other_user = db.get(User, other_user_id)
     if not other_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -118,7 +119,7 @@ def get_conversations(
     # Get user details and latest message for each conversation
     conversations = []
     for user_id in user_ids:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user:
             # Get the latest message in this conversation
             latest_message = db.query(Message).filter(
@@ -193,15 +194,15 @@ async def get_user_from_token(token: str, db):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         print("Decoded payload:", payload)
-        email: str = payload.get("sub")
-        if email is None:
+        sub = payload.get("sub")
+        if sub is None:
             print("No sub in token payload")
             return None
-        user = db.query(User).filter(User.email == email).first()
+        user = db.get(User, int(sub))
         print("User found:", user)
         return user
-    except JWTError as e:
-        print("JWTError:", e)
+    except (PyJWTError, ValueError) as e:
+        print("Token error:", e)
         return None
 
 @router.websocket("/ws/{other_user_id}")
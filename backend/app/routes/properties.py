@@ -1,5 +1,6 @@
 from app import schemas
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -273,12 +274,9 @@ async def upload_property_images(
     # 处理多张图片上传
     for i, file in enumerate(files):
         try:
-            # 读取图片数据用于分析
-            image_data = await file.read()
-            await file.seek(0)  # 重置文件指针
-            
-            # 分析图片特征
-            analysis_result = image_service.analyze_property_listing_image(image_data)
+            # 分析图片特征 (直接读取上传的临时文件，不整体读入内存)
+            await file.seek(0)
+            analysis_result = await run_in_threadpool(image_service.analyze_property_listing_image, file.file)
             
             # 上传到S3
             image_url = await storage_service.upload_image(file, property_id, landlord_profile.id)
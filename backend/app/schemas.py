@@ -123,6 +123,40 @@ class LandlordInfo(BaseModel):
     class Config:
         from_attributes = True
 
+# Admin property details (GET /admin/property-details/{id})
+class AdminPropertyDetail(BaseModel):
+    id: int
+    title: str
+    price: float
+    description: Optional[str] = None
+    address: Optional[str] = None
+    property_type: Optional[str] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[float] = None
+    area: Optional[float] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    created_at: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+class AdminLandlordDetail(BaseModel):
+    id: Optional[int] = None
+    company_name: Optional[str] = None
+    contact_phone: Optional[str] = None
+    description: Optional[str] = None
+    verification_status: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class AdminPropertyDetailsResponse(BaseModel):
+    property: AdminPropertyDetail
+    landlord: AdminLandlordDetail
+
 class PropertyResponse(PropertyBase):
     id: int
     landlord_id: int 
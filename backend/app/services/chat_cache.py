@@ -0,0 +1,109 @@
+# app/services/chat_cache.py
+"""
+Response cache for the chat LLM call.
+
+Two tiers, checked in order:
+- exact: normalized message text -> result, 24h TTL
+- semantic: embed the message with the local sentence-transformers model and
+  return the result of the closest previous message from the same user when
+  cosine >= threshold
+
+A single-turn reply depends only on the message, so exact entries are shared
+across users. The semantic tier is kept per user and only holds results without
+extracted preferences: near-duplicates like "2 bedroom under $1200" and
+"3 bedroom under $1500" embed almost identically, and the caller saves the
+returned preferences. The semantic tier is best-effort: if the embedding model
+can't be loaded it is switched off and only the exact tier is used.
+
+The Gemini call is made here rather than through ai_gateway_demo, so the cache
+sits next to it; the gateway's SemanticCache has no TTL, size bound or per-user
+scope.
+"""
+
+import copy
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(message: str) -> str:
+    return " ".join(message.lower().split())
+
+
+class ChatResponseCache:
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 100,
+        max_users: int = 1000,
+        ttl: float = 24 * 3600,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries  # per user
+        self._exact = TTLCache(maxsize=10_000, ttl=ttl)
+        # user id -> (unit vectors, results)
+        self._semantic = TTLCache(maxsize=max_users, ttl=ttl)
+        self._lock = threading.Lock()
+        self.semantic_enabled = True
+
+    @staticmethod
+    def _exact_key(message: str) -> bytes:
+        return hashlib.blake2b(_normalize(message).encode(), digest_size=16).digest()
+
+    def _embed(self, message: str) -> Optional[np.ndarray]:
+        if not self.semantic_enabled:
+            return None
+        try:
+            from app.services.embedding_service import get_embedding_service
+            return get_embedding_service().encode_text(_normalize(message), normalize=True)
+        except Exception as e:
+            logger.warning(f"Semantic chat cache disabled, embedding unavailable: {e}")
+            self.semantic_enabled = False
+            return None
+
+    def get(self, message: str, user_id: Optional[int] = None) -> Optional[Dict]:
+        """Return a copy of a cached result for this message, or None."""
+        result = self._exact.get(self._exact_key(message))
+        if result is not None:
+            return copy.deepcopy(result)
+
+        if user_id is None:
+            return None
+        with self._lock:
+            index = self._semantic.get(user_id)
+        if index is None:
+            return None
+        vec = self._embed(message)
+        if vec is None:
+            return None
+        vectors, results = index
+        # rows are unit vectors, so the dot product is the cosine similarity
+        sims = vectors @ vec
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        return copy.deepcopy(results[best])
+
+    def put(self, message: str, result: Dict, user_id: Optional[int] = None) -> None:
+        result = copy.deepcopy(result)
+        self._exact.set(self._exact_key(message), result)
+
+        # Results carrying preferences depend on the exact wording; exact tier only
+        if user_id is None or result.get("preferences"):
+            return
+        vec = self._embed(message)
+        if vec is None:
+            return
+        with self._lock:
+            vectors, results = self._semantic.get(user_id) or (np.zeros((0, 384), dtype=np.float32), [])
+            self._semantic.set(user_id, (
+                np.vstack([vectors, vec[np.newaxis, :]])[-self.max_entries:],
+                (results + [result])[-self.max_entries:],
+            ))
@@ -1,11 +1,18 @@
 # app/services/chat_service.py
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
 import google.generativeai as genai
-import re
-import json
+import orjson
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import ReturningInsert
 
 from app.config import settings
-from app.models import UserPreference
+from app.models import UserPreference, refresh_preferences_json
+from app.recommendations import invalidate_recommendations
+from app.services.chat_cache import ChatResponseCache
 
 class ChatService:
     """Service for AI chat interactions and preference extraction"""
@@ -15,19 +22,30 @@ class ChatService:
         self.api_key = settings.GEMINI_API_KEY
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.client = genai.GenerativeModel('gemini-2.5-flash')
-            print("ChatService: Gemini initialized (cost-effective!)")
+            # Preference extraction is a small task: a lite model handles most turns
+            self.client = genai.GenerativeModel(settings.CHAT_MODEL)
+            self.fallback_client = (
+                genai.GenerativeModel(settings.CHAT_FALLBACK_MODEL)
+                if settings.CHAT_FALLBACK_MODEL and settings.CHAT_FALLBACK_MODEL != settings.CHAT_MODEL
+                else None
+            )
+            print(f"ChatService: Gemini initialized ({settings.CHAT_MODEL}, cost-effective!)")
         else:
             self.client = None
+            self.fallback_client = None
             print("ChatService: No GEMINI_API_KEY found")
+        self.response_cache = ChatResponseCache()
     
-    def chat_with_ai(self, user_message: str, history: Optional[List[Dict]] = None) -> Dict:
+    async def chat_with_ai(
+        self, user_message: str, history: Optional[List[Dict]] = None, user_id: Optional[int] = None
+    ) -> Dict:
         """
         Process user message with AI and extract housing preferences
         
         Args:
             user_message: The user's input message
             history: Optional list of previous message dictionaries
+            user_id: Optional id of the asking user; scopes the semantic cache tier
             
         Returns:
             Dictionary containing AI response and extracted preferences
@@ -55,10 +73,9 @@ class ChatService:
            - pet_friendly (yes, no, type of pet)
            - study_space (needs desk, separate room, etc.)
         
-        Return your response in two parts:
-        1. A helpful, conversational response to the user
-        2. A JSON object with extracted preferences in this format:
+        Return a single JSON object in this format:
            {
+             "reply": "A helpful, conversational response to the user",
              "preferences": [
                {
                  "key": "property_type",
@@ -79,6 +96,13 @@ class ChatService:
                 "preferences": []
             }
 
+        # Single-turn replies depend only on the message, so repeated or
+        # near-duplicate questions are served from cache (embedding runs off the loop)
+        if not history:
+            cached = await asyncio.to_thread(self.response_cache.get, user_message, user_id)
+            if cached is not None:
+                return cached
+
         # Build conversation context for Gemini
         conversation = system_message + "\n\n"
 
@@ -92,13 +116,53 @@ class ChatService:
         # Add current user message
         conversation += f"user: {user_message}\n\nAssistant:"
 
-        # Call Gemini API
+        # Cheap model first; escalate to the stronger model only when the cheap
+        # one fails or its reply can't be parsed
+        bot_response, error_response = await self._generate(self.client, conversation)
+        parsed = self._parse_response(bot_response) if bot_response is not None else None
+        if parsed is None and self.fallback_client is not None:
+            print(f"ChatService: escalating to {settings.CHAT_FALLBACK_MODEL}")
+            fallback_response, fallback_error = await self._generate(self.fallback_client, conversation)
+            if fallback_response is not None:
+                bot_response, error_response = fallback_response, fallback_error
+                parsed = self._parse_response(bot_response)
+
+        if bot_response is None:
+            # _generate always pairs a missing reply with an error result
+            return error_response or {
+                "response": "Sorry, I encountered an error. Please try again.",
+                "preferences": []
+            }
+
+        preferences: List[Dict]
+        if parsed is None:
+            # If JSON parsing fails, return original response
+            clean_response, preferences = bot_response.strip(), []
+        else:
+            clean_response, preferences = parsed
+
+        result = {
+            "response": clean_response,
+            "preferences": preferences
+        }
+        if not history:
+            await asyncio.to_thread(self.response_cache.put, user_message, result, user_id)
+        return result
+
+    async def _generate(self, client, conversation: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Call a Gemini model (async so the event loop keeps serving other requests)
+
+        Returns:
+            (response text, None) on success, or (None, error result) on failure
+        """
         try:
-            response = self.client.generate_content(
+            response = await client.generate_content_async(
                 conversation,
                 generation_config=genai.types.GenerationConfig(
                     temperature=0.7,
                     max_output_tokens=1000,
+                    response_mime_type="application/json",  # JSON mode: the reply is the payload
                 ),
                 safety_settings=[
                     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
@@ -111,7 +175,7 @@ class ChatService:
             # Check if response was blocked or has no content
             if not response.candidates or len(response.candidates) == 0:
                 print("Gemini returned no candidates (likely blocked)")
-                return {
+                return None, {
                     "response": "Sorry, I couldn't process that request. Please try rephrasing your message.",
                     "preferences": []
                 }
@@ -123,7 +187,7 @@ class ChatService:
                 reason_map = {0: "UNSPECIFIED", 1: "STOP", 2: "SAFETY", 3: "MAX_TOKENS", 4: "RECITATION", 5: "OTHER"}
                 reason_name = reason_map.get(candidate.finish_reason, f"UNKNOWN({candidate.finish_reason})")
                 print(f"Gemini response blocked or incomplete (finish_reason={reason_name})")
-                return {
+                return None, {
                     "response": "Sorry, I couldn't process that request. Please try rephrasing your message.",
                     "preferences": []
                 }
@@ -131,50 +195,42 @@ class ChatService:
             # Check if content exists
             if not hasattr(candidate, 'content') or not candidate.content.parts:
                 print("Gemini response has no content")
-                return {
+                return None, {
                     "response": "Sorry, I encountered an error. Please try again.",
                     "preferences": []
                 }
 
-            bot_response = response.text
+            return response.text, None
         except Exception as e:
             print(f"Gemini API error: {e}")
-            return {
+            return None, {
                 "response": "Sorry, I encountered an error. Please try again.",
                 "preferences": []
             }
-        
-        # Try to extract preference information
-        preferences = []
+
+    def _parse_response(self, bot_response: str) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Split a JSON-mode reply into (clean response, preferences)
+
+        Returns None when the reply isn't the expected JSON payload.
+        """
         try:
-            # Find JSON part in the response using regex
-            json_match = re.search(r'\{.*\}', bot_response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                preferences_data = json.loads(json_str)
-                
-                if "preferences" in preferences_data:
-                    preferences = preferences_data["preferences"]
-                    # Add default values if missing
-                    for pref in preferences:
-                        if "category" not in pref:
-                            pref["category"] = "property"
-                        if "description" not in pref:
-                            pref["description"] = f"Preference for {pref['key']}: {pref['value']}"
-            
-            # Return clean response without JSON
-            clean_response = re.sub(r'\{.*\}', '', bot_response, flags=re.DOTALL).strip()
-            
+            data = orjson.loads(bot_response)
+            clean_response = data["reply"].strip()
+
+            preferences = data.get("preferences", [])
+            # Add default values if missing
+            for pref in preferences:
+                if "category" not in pref:
+                    pref["category"] = "property"
+                if "description" not in pref:
+                    pref["description"] = f"Preference for {pref['key']}: {pref['value']}"
+
+            return clean_response, preferences
         except Exception as e:
-            # If JSON parsing fails, return original response
-            clean_response = bot_response
             print(f"Error parsing preferences: {e}")
-        
-        return {
-            "response": clean_response,
-            "preferences": preferences
-        }
-    
+            return None
+
     def create_preference_objects(self, user_id: int, preferences: List[Dict]) -> List[UserPreference]:
         """
         Convert extracted preferences to UserPreference objects
@@ -202,4 +258,64 @@ class ChatService:
             )
             preference_objects.append(preference)
         
-        return preference_objects
\ No newline at end of file
+        return preference_objects
+
+    def save_preferences(self, db: Session, preference_objects: List[UserPreference]) -> List[Dict]:
+        """
+        Upsert chat preferences for one user in a single statement
+
+        INSERT ... ON CONFLICT on the chat rows' (user_id, key, category, source)
+        unique index: a preference the user already has gets the new value and
+        timestamp. Core statements skip the flush hooks, so preferences_json and
+        the recommendation cache are refreshed here.
+
+        Returns:
+            The stored rows (key, value, category, created_at) from RETURNING
+        """
+        if not preference_objects:
+            return []
+
+        now = datetime.utcnow()
+        # One row per key and category (later ones win): ON CONFLICT can't touch a row twice
+        rows = {}
+        for pref_obj in preference_objects:
+            rows[(pref_obj.preference_key, pref_obj.preference_category)] = {
+                "user_id": pref_obj.user_id,
+                "preference_key": pref_obj.preference_key,
+                "preference_value": pref_obj.preference_value,
+                "preference_category": pref_obj.preference_category,
+                "source": pref_obj.source,
+                "created_at": now,
+            }
+
+        insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+        stmt = insert(UserPreference).values(list(rows.values()))
+        upsert: ReturningInsert[str, str, str, datetime] = stmt.on_conflict_do_update(
+            index_elements=["user_id", "preference_key", "preference_category", "source"],
+            index_where=UserPreference.source == "chat",
+            set_={
+                "preference_value": stmt.excluded.preference_value,
+                "created_at": stmt.excluded.created_at,
+            },
+        ).returning(
+            UserPreference.preference_key.label("key"),
+            UserPreference.preference_value.label("value"),
+            UserPreference.preference_category.label("category"),
+            UserPreference.created_at,
+        )
+        saved = [dict(row) for row in db.execute(upsert).mappings()]
+        refresh_preferences_json(db.connection(), [preference_objects[0].user_id])
+        db.commit()
+        invalidate_recommendations()
+        return saved
+
+# Singleton instance, so the Gemini client and its connections are reused
+_chat_service = None
+
+
+def get_chat_service() -> ChatService:
+    """Get or create singleton chat service."""
+    global _chat_service
+    if _chat_service is None:
+        _chat_service = ChatService()
+    return _chat_service
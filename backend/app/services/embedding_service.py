@@ -95,7 +95,7 @@ class EmbeddingService:
             db.execute(
                 text("""
                     INSERT INTO property_embeddings (id, embedding, model_name)
-                    VALUES (:id, CAST(:embedding AS jsonb), :model_name)
+                    VALUES (:id, CAST(:embedding AS vector), :model_name)
                     ON CONFLICT (id)
                     DO UPDATE SET
                         embedding = EXCLUDED.embedding,
@@ -235,22 +235,45 @@ class EmbeddingService:
         # Encode query
         query_embedding = self.encode_text(query_text, normalize=True)
 
-        # Get all relevant embeddings
-        embeddings = self.get_all_embeddings(db, property_ids)
+        # pgvector computes cosine distance (<=>) in the database and uses the
+        # HNSW index, so only the top `limit` rows come back
+        if property_ids:
+            query = text("""
+                SELECT id, 1 - (embedding <=> CAST(:query_vec AS vector)) AS similarity
+                FROM property_embeddings
+                WHERE id = ANY(:ids) AND model_name = :model_name
+                ORDER BY embedding <=> CAST(:query_vec AS vector)
+                LIMIT :limit
+            """)
+            params = {"ids": property_ids}
+        else:
+            query = text("""
+                SELECT id, 1 - (embedding <=> CAST(:query_vec AS vector)) AS similarity
+                FROM property_embeddings
+                WHERE model_name = :model_name
+                ORDER BY embedding <=> CAST(:query_vec AS vector)
+                LIMIT :limit
+            """)
+            params = {}
 
-        if not embeddings:
-            logger.warning("No embeddings found for vector search")
+        try:
+            result = db.execute(
+                query,
+                {
+                    **params,
+                    "query_vec": json.dumps(query_embedding.tolist()),
+                    "model_name": self.model_name,
+                    "limit": limit,
+                }
+            )
+            similarities = [(row[0], float(row[1])) for row in result]
+        except Exception as e:
+            logger.error(f"Error running vector search: {e}")
             return []
 
-        # Compute similarities
-        similarities = []
-        for prop_id, prop_embedding in embeddings.items():
-            similarity = self.cosine_similarity(query_embedding, prop_embedding)
-            similarities.append((prop_id, similarity))
-
-        # Sort by similarity (descending) and limit
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:limit]
+        if not similarities:
+            logger.warning("No embeddings found for vector search")
+        return similarities
 
 
 # Global instance
@@ -0,0 +1,25 @@
+"""
+Pooled HTTP sessions for the property fetchers.
+
+A requests.Session keeps TCP/TLS connections alive between calls to the same
+host, so repeated RapidAPI requests skip the handshake. Connection errors are
+retried with a short backoff; HTTP status codes are returned to the caller,
+which decides what to retry.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_http_session(pool_maxsize: int = 32) -> requests.Session:
+    """Create a session with a connection pool of `pool_maxsize` per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.3, allowed_methods=["GET"], status_forcelist=()),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
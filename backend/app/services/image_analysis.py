@@ -1,7 +1,7 @@
 import base64
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, BinaryIO, Union
 import google.generativeai as genai
 from app.config import settings
 
@@ -26,12 +26,12 @@ class SimpleImageAnalysisService:
             self.client = None
             self.client_type = None
     
-    def _extract_features(self, image_bytes: bytes, analysis_type: str) -> Dict[str, Any]:
+    def _extract_features(self, image_bytes: Union[bytes, BinaryIO], analysis_type: str) -> Dict[str, Any]:
         """
         Extract features from an image using Gemini Vision API
 
         Args:
-            image_bytes: Image data in bytes
+            image_bytes: Image data in bytes, or a binary file object (e.g. an upload's spooled file)
             analysis_type: 'tenant_preference' or 'property_listing'
 
         Returns:
@@ -66,8 +66,8 @@ class SimpleImageAnalysisService:
             import PIL.Image
             import io
 
-            # Convert bytes to PIL Image for Gemini
-            image = PIL.Image.open(io.BytesIO(image_bytes))
+            # Convert to PIL Image for Gemini; file objects are read directly, not copied into bytes first
+            image = PIL.Image.open(image_bytes if hasattr(image_bytes, "read") else io.BytesIO(image_bytes))
 
             # Generate content with Gemini
             response = self.client.generate_content(
@@ -177,24 +177,24 @@ class SimpleImageAnalysisService:
         
         return normalized_features
     
-    def analyze_tenant_preference_image(self, image_bytes: bytes) -> Dict[str, Any]:
+    def analyze_tenant_preference_image(self, image_bytes: Union[bytes, BinaryIO]) -> Dict[str, Any]:
         """
         Analyze an image uploaded by a tenant representing their ideal home
         
         Args:
-            image_bytes: Image data in bytes
+            image_bytes: Image data in bytes or a binary file object
         
         Returns:
             Analyzed features of the ideal home
         """
         return self._extract_features(image_bytes, 'tenant_preference')
     
-    def analyze_property_listing_image(self, image_bytes: bytes) -> Dict[str, Any]:
+    def analyze_property_listing_image(self, image_bytes: Union[bytes, BinaryIO]) -> Dict[str, Any]:
         """
         Analyze an image uploaded by a landlord of their property
         
         Args:
-            image_bytes: Image data in bytes
+            image_bytes: Image data in bytes or a binary file object
         
         Returns:
             Analyzed features of the property
@@ -1,8 +1,12 @@
-import requests
 from typing import Dict
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models import Property
+from app.services.http_session import create_http_session
+
+def _header_int(response, name: str):
+    value = response.headers.get(name)
+    return int(value) if value and value.isdigit() else None
 
 class RapidAPIFetcher:
     def __init__(self, api_key: str):
@@ -11,6 +15,8 @@ class RapidAPIFetcher:
             "X-RapidAPI-Key": api_key,
             "X-RapidAPI-Host": "realty-mole-property-api.p.rapidapi.com"
         }
+        # 所有请求共享连接池 (批量获取会并发调用)
+        self._session = create_http_session(pool_maxsize=64)
     
     def get_real_properties(self, db: Session, landlord_id: int, limit: int = 20) -> Dict:
         try:
@@ -21,12 +27,14 @@ class RapidAPIFetcher:
                 "limit": min(limit, 50)
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._session.get(url, headers=self.headers, params=params)
             
             if response.status_code != 200:
                 return {
                     'success': False,
                     'error': f'API call failed with status {response.status_code}',
+                    'status_code': response.status_code,
+                    'retry_after': _header_int(response, 'Retry-After'),
                     'saved_count': 0
                 }
             
@@ -91,7 +99,8 @@ class RapidAPIFetcher:
                 'total_fetched': len(listings),
                 'saved_count': saved_count,
                 'properties': properties,
-                'api_calls_used': 1
+                'api_calls_used': 1,
+                'rate_limit_remaining': _header_int(response, 'X-RateLimit-Requests-Remaining')
             }
             
         except Exception as e:
@@ -1,8 +1,8 @@
-import requests
 from typing import Dict, List
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.models import Property, User, LandlordProfile
+from app.services.http_session import create_http_session
 
 class Realtor16Fetcher:
     def __init__(self, api_key: str):
@@ -11,6 +11,8 @@ class Realtor16Fetcher:
             "X-RapidAPI-Key": api_key,
             "X-RapidAPI-Host": "realtor16.p.rapidapi.com"
         }
+        # 复用连接池，避免每次请求重新握手
+        self._session = create_http_session()
     
     def get_real_properties_with_landlords(self, db: Session, limit: int = 20) -> Dict:
         """获取真实房源并自动创建对应的房东（包含原始链接）"""
@@ -23,7 +25,7 @@ class Realtor16Fetcher:
                 "radius": "30"            # 30英里半径
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._session.get(url, headers=self.headers, params=params)
             
             if response.status_code != 200:
                 return {
@@ -1,7 +1,9 @@
 import boto3
 import os
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 from uuid import uuid4
 
 class S3ImageService:
@@ -23,25 +25,27 @@ class S3ImageService:
     async def upload_image(self, file: UploadFile, property_id: int, landlord_id: int) -> str:
         """上传图片到S3并返回公共URL"""
         try:
-            # 读取文件内容
-            contents = await file.read()
+            # 从头读取 (上传前可能已被分析读过)
+            await file.seek(0)
             
             # 生成唯一文件名（使用UUID避免冲突）
             file_ext = os.path.splitext(file.filename)[1] if file.filename else ".jpg"
             unique_filename = f"properties/{landlord_id}/{property_id}/{uuid4()}{file_ext}"
             
-            # 上传到S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=unique_filename,
-                Body=contents,
-                ContentType=file.content_type or "image/jpeg"
+            # 上传到S3 (boto3 是同步阻塞调用，放到线程池，不阻塞事件循环)
+            # upload_fileobj 分块读取临时文件上传，不把整张图片读入内存
+            await run_in_threadpool(
+                self.s3_client.upload_fileobj,
+                file.file,
+                self.bucket_name,
+                unique_filename,
+                ExtraArgs={"ContentType": file.content_type or "image/jpeg"}
             )
             
             # 构建并返回图片URL
             return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{unique_filename}"
         
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             print(f"S3上传错误: {e}")
             raise Exception(f"图片上传失败: {str(e)}")
         finally:
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.auth import get_password_hash
+from app.models import User, Property, LandlordProfile
+from app.rate_limit import AsyncRateLimiter
+from app.routes import admin_sync
+from tests.conftest import engine, TestingSessionLocal
+
+
+class FakeFetcher:
+    """Saves one property per call, the way the real fetchers commit each row"""
+
+    def get_real_properties(self, db, landlord_id, limit=20):
+        db.add(Property(title="Fetched listing", price=1200.0, landlord_id=landlord_id, is_active=True))
+        db.commit()
+        return {"success": True, "saved_count": 1}
+
+
+class RateLimitedFetcher(FakeFetcher):
+    """Answers the first call with a 429, then fetches normally"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_real_properties(self, db, landlord_id, limit=20):
+        self.calls += 1
+        if self.calls == 1:
+            return {"success": False, "status_code": 429, "error": "Too Many Requests", "saved_count": 0}
+        return super().get_real_properties(db, landlord_id, limit)
+
+
+@pytest.fixture
+def landlords(test_db, monkeypatch):
+    """Two landlord profiles, with the batch fetch pointed at the test database"""
+    monkeypatch.setattr(admin_sync, "engine", engine)
+    monkeypatch.setattr(admin_sync, "SessionLocal", TestingSessionLocal)
+
+    profiles = []
+    for i in range(2):
+        user = User(
+            email=f"landlord{i}@example.com",
+            username=f"landlord{i}",
+            password_hash=get_password_hash("Test1234"),
+            user_type="landlord"
+        )
+        test_db.add(user)
+        test_db.flush()
+        profile = LandlordProfile(user_id=user.id)
+        test_db.add(profile)
+        profiles.append(profile)
+    test_db.commit()
+    return [p.id for p in profiles]
+
+
+def test_fetch_for_landlord_saves_properties(test_db, landlords):
+    """Test an unlocked landlord gets its fetched properties saved"""
+    result = admin_sync._fetch_for_landlord(FakeFetcher(), landlords[0], 5)
+
+    assert result["success"] is True
+    assert test_db.query(Property).filter(Property.landlord_id == landlords[0]).count() == 1
+
+
+def test_fetch_for_landlord_skips_locked_landlord(test_db, landlords, monkeypatch):
+    """Test a landlord locked by another job is skipped, others still fetch"""
+    locked_id, free_id = landlords
+    monkeypatch.setattr(
+        admin_sync, "_try_lock_landlord", lambda conn, landlord_id: landlord_id != locked_id
+    )
+
+    skipped = admin_sync._fetch_for_landlord(FakeFetcher(), locked_id, 5)
+    fetched = admin_sync._fetch_for_landlord(FakeFetcher(), free_id, 5)
+
+    assert skipped["success"] is False
+    assert skipped["saved_count"] == 0
+    assert fetched["success"] is True
+    assert test_db.query(Property).filter(Property.landlord_id == locked_id).count() == 0
+    assert test_db.query(Property).filter(Property.landlord_id == free_id).count() == 1
+
+
+def test_list_landlords_walks_pages_with_cursor(test_db, override_get_db, landlords):
+    """Test two pages via next_cursor, each reporting the full landlord total"""
+    admin_sync.invalidate_admin_cache()
+    headers = {"X-Admin-Key": admin_sync.ADMIN_SECRET}
+
+    with TestClient(app) as client:
+        first = client.get("/api/v1/admin/landlords", params={"limit": 1}, headers=headers).json()
+        second = client.get(
+            "/api/v1/admin/landlords",
+            params={"limit": 1, "cursor": first["next_cursor"]},
+            headers=headers
+        ).json()
+
+    assert [landlord["id"] for landlord in first["landlords"]] == [landlords[0]]
+    assert first["next_cursor"] == landlords[0]
+    assert [landlord["id"] for landlord in second["landlords"]] == [landlords[1]]
+    assert first["total_landlords"] == second["total_landlords"] == 2
+
+
+def test_batch_fetch_retries_after_429(test_db, landlords, monkeypatch):
+    """Test a 429 is retried and the second attempt's properties are counted"""
+    monkeypatch.setattr(admin_sync, "rapidapi_limiter", AsyncRateLimiter(0))
+    monkeypatch.setattr(admin_sync, "FETCH_BACKOFF_SECONDS", 0.01)
+    fetcher = RateLimitedFetcher()
+    job = admin_sync._new_job(total=1)
+
+    asyncio.run(admin_sync._batch_fetch(job, fetcher, [landlords[0]], 5))
+
+    assert fetcher.calls == 2
+    assert job["status"] == "completed"
+    assert job["done"] == 1
+    assert job["result"]["successful_landlords"] == 1
+    assert job["result"]["total_properties_saved"] == 1
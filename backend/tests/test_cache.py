@@ -0,0 +1,30 @@
+import time
+
+from app.cache import TTLCache
+
+
+def test_get_returns_stored_value():
+    """Test a stored value is returned before it expires"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("token", 42)
+    assert cache.get("token") == 42
+    assert cache.get("missing") is None
+
+
+def test_entry_expires_after_ttl():
+    """Test entries are dropped once their ttl has passed"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("token", 42, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("token") is None
+
+
+def test_oldest_entry_evicted_at_maxsize():
+    """Test the cache never grows past maxsize"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
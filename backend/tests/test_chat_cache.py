@@ -0,0 +1,78 @@
+import numpy as np
+
+from app.services.chat_cache import ChatResponseCache
+
+
+def _unit(*values):
+    vec = np.zeros(384, dtype=np.float32)
+    vec[:len(values)] = values
+    return vec / np.linalg.norm(vec)
+
+
+def test_exact_hit_ignores_case_and_whitespace():
+    """Test the exact tier matches normalized message text"""
+    cache = ChatResponseCache()
+    cache.semantic_enabled = False
+    cache.put("I want a 2 bedroom apartment", {"response": "ok", "preferences": []})
+    assert cache.get("  i want a 2 BEDROOM apartment ") == {"response": "ok", "preferences": []}
+    assert cache.get("I want a house") is None
+
+
+def test_semantic_hit_above_threshold(monkeypatch):
+    """Test near-duplicate messages are served by the semantic tier"""
+    cache = ChatResponseCache(threshold=0.95)
+    vectors = {
+        "looking for a quiet studio": _unit(1.0, 0.0),
+        "looking for a quiet studio please": _unit(1.0, 0.05),
+        "need parking": _unit(0.0, 1.0),
+    }
+    monkeypatch.setattr(cache, "_embed", lambda message: vectors[message])
+
+    cache.put("looking for a quiet studio", {"response": "studio", "preferences": []}, user_id=1)
+    assert cache.get("looking for a quiet studio please", user_id=1)["response"] == "studio"
+    assert cache.get("need parking", user_id=1) is None
+
+
+def test_semantic_tier_is_per_user(monkeypatch):
+    """Test one user's near-duplicate is never served another user's reply"""
+    cache = ChatResponseCache(threshold=0.95)
+    vectors = {
+        "looking for a quiet studio": _unit(1.0, 0.0),
+        "looking for a quiet studio please": _unit(1.0, 0.05),
+    }
+    monkeypatch.setattr(cache, "_embed", lambda message: vectors[message])
+
+    cache.put("looking for a quiet studio", {"response": "studio", "preferences": []}, user_id=1)
+    assert cache.get("looking for a quiet studio please", user_id=2) is None
+
+
+def test_numeric_near_duplicate_not_served_with_preferences(monkeypatch):
+    """Test messages differing only in numbers don't share extracted preferences"""
+    cache = ChatResponseCache(threshold=0.95)
+    # MiniLM puts these almost on top of each other
+    vectors = {
+        "2 bedroom under $1200": _unit(1.0, 0.01),
+        "3 bedroom under $1500": _unit(1.0, 0.02),
+    }
+    monkeypatch.setattr(cache, "_embed", lambda message: vectors[message])
+
+    result = {
+        "response": "Noted!",
+        "preferences": [
+            {"key": "bedrooms", "value": "2", "category": "property"},
+            {"key": "price_range", "value": "1200", "category": "property"},
+        ],
+    }
+    cache.put("2 bedroom under $1200", result, user_id=1)
+
+    assert cache.get("3 bedroom under $1500", user_id=1) is None
+    assert cache.get("2 bedroom under $1200", user_id=1) == result
+
+
+def test_cached_result_is_a_copy():
+    """Test callers can't mutate the cached entry"""
+    cache = ChatResponseCache()
+    cache.semantic_enabled = False
+    cache.put("hi", {"response": "hello", "preferences": []})
+    cache.get("hi")["preferences"].append({"key": "x"})
+    assert cache.get("hi")["preferences"] == []
@@ -0,0 +1,84 @@
+import pytest
+
+from app.auth import get_password_hash
+from app.models import User, TenantProfile, UserPreference
+from app.services.chat_service import ChatService
+
+
+@pytest.fixture
+def chat_service():
+    return ChatService()
+
+
+@pytest.fixture
+def tenant(test_db):
+    user = User(
+        email="tenant@example.com",
+        username="tenantuser",
+        password_hash=get_password_hash("Test1234"),
+        user_type="tenant"
+    )
+    test_db.add(user)
+    test_db.flush()
+    test_db.add(TenantProfile(user_id=user.id))
+    test_db.commit()
+    return user
+
+
+def _save(chat_service, db, user, prefs):
+    objects = chat_service.create_preference_objects(user_id=user.id, preferences=prefs)
+    return chat_service.save_preferences(db, objects)
+
+
+def _chat_rows(db, user):
+    return {
+        (p.preference_category, p.preference_key): p.preference_value
+        for p in db.query(UserPreference).filter(UserPreference.user_id == user.id)
+    }
+
+
+def test_save_preferences_inserts_rows(test_db, chat_service, tenant):
+    """Test new preferences are inserted and returned"""
+    saved = _save(chat_service, test_db, tenant, [
+        {"key": "bedrooms", "value": "2", "category": "property"},
+        {"key": "pets", "value": "cat", "category": "lifestyle"},
+    ])
+
+    assert {(s["category"], s["key"], s["value"]) for s in saved} == {
+        ("property", "bedrooms", "2"), ("lifestyle", "pets", "cat")
+    }
+    assert _chat_rows(test_db, tenant) == {("property", "bedrooms"): "2", ("lifestyle", "pets"): "cat"}
+
+
+def test_save_preferences_upserts_existing_key(test_db, chat_service, tenant):
+    """Test saving a key again updates the row instead of adding one"""
+    _save(chat_service, test_db, tenant, [{"key": "bedrooms", "value": "2", "category": "property"}])
+    saved = _save(chat_service, test_db, tenant, [{"key": "bedrooms", "value": "3", "category": "property"}])
+
+    assert [s["value"] for s in saved] == ["3"]
+    assert test_db.query(UserPreference).filter(UserPreference.user_id == tenant.id).count() == 1
+    assert _chat_rows(test_db, tenant) == {("property", "bedrooms"): "3"}
+
+
+def test_save_preferences_collapses_duplicates_in_one_call(test_db, chat_service, tenant):
+    """Test a key repeated within one call is stored once with the last value"""
+    saved = _save(chat_service, test_db, tenant, [
+        {"key": "budget", "value": "1500", "category": "property"},
+        {"key": "budget", "value": "1800", "category": "property"},
+    ])
+
+    assert [s["value"] for s in saved] == ["1800"]
+    assert _chat_rows(test_db, tenant) == {("property", "budget"): "1800"}
+
+
+def test_save_preferences_refreshes_preferences_json(test_db, chat_service, tenant):
+    """Test the tenant profile's preferences_json mirrors the saved rows"""
+    _save(chat_service, test_db, tenant, [{"key": "bedrooms", "value": "2", "category": "property"}])
+    _save(chat_service, test_db, tenant, [
+        {"key": "bedrooms", "value": "3", "category": "property"},
+        {"key": "pets", "value": "cat", "category": "lifestyle"},
+    ])
+
+    profile = test_db.query(TenantProfile).filter(TenantProfile.user_id == tenant.id).one()
+    test_db.refresh(profile)
+    assert profile.preferences_json == {"property": {"bedrooms": "3"}, "lifestyle": {"pets": "cat"}}
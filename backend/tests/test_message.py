@@ -69,7 +69,7 @@ def test_tokens(test_users):
     tokens = {}
     for user in test_users:
         access_token = create_access_token(
-            data={"sub": user.email},
+            data={"sub": str(user.id), "email": user.email},
             expires_delta=timedelta(minutes=30)
         )
         tokens[user.id] = access_token
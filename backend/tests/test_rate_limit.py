@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app import rate_limit
+from app.rate_limit import AsyncRateLimiter, RateLimitExceeded
+
+
+class FakeClock:
+    """Stands in for time.monotonic, datetime.now and asyncio.sleep in app.rate_limit"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.today = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.today
+
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", clock.sleep)
+    monkeypatch.setattr(rate_limit, "datetime", FakeDatetime)
+    return clock
+
+
+def test_acquire_spaces_calls_by_interval(clock):
+    """Test back-to-back calls wait one interval apart"""
+    limiter = AsyncRateLimiter(60)
+
+    async def run():
+        for _ in range(3):
+            await limiter.acquire()
+
+    asyncio.run(run())
+
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_daily_cap_raises_and_resets_next_day(clock):
+    """Test the cap raises RateLimitExceeded and is lifted at midnight UTC"""
+    limiter = AsyncRateLimiter(0, daily_cap=2)
+
+    async def run():
+        await limiter.acquire()
+        await limiter.acquire()
+        assert limiter.exhausted
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire()
+
+        clock.today = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        assert not limiter.exhausted
+        await limiter.acquire()
+
+    asyncio.run(run())
+
+    assert limiter._used_today == 1
+
+
+def test_pause_holds_back_next_call(clock):
+    """Test pause() delays the next acquire by the paused seconds"""
+    limiter = AsyncRateLimiter(0)
+
+    async def run():
+        await limiter.acquire()
+        limiter.pause(5)
+        await limiter.acquire()
+
+    asyncio.run(run())
+
+    assert clock.sleeps == [5.0]
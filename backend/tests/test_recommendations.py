@@ -1,6 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app import recommendations
 from app.auth import get_password_hash
 from app.models import User, Property, UserPreference, TenantProfile, LandlordProfile
 
@@ -290,4 +291,21 @@ def test_get_roommate_recommendations_as_landlord(client, test_db):
     )
     
     # This should fail with a 403 Forbidden
-    assert response.status_code == 403
\ No newline at end of file
+    assert response.status_code == 403
+
+
+def test_recommendation_cache_invalidated_by_profile_change(test_db, test_tenant, test_roommates):
+    """Cached recommendations are dropped when a scoring field is committed"""
+    key = ("roommates", test_tenant.id, 10)
+    first = recommendations.get_roommate_recommendations_for_user(test_db, test_tenant.id)
+    assert len(first) == 2
+    assert recommendations._recommendation_cache.get(key) is not None
+
+    # Served from cache, re-loaded into this session
+    again = recommendations.get_roommate_recommendations_for_user(test_db, test_tenant.id)
+    assert [(u.id, s) for u, s in again] == [(u.id, s) for u, s in first]
+
+    profile = test_db.query(TenantProfile).filter(TenantProfile.user_id == test_tenant.id).first()
+    profile.budget = 1600.0
+    test_db.commit()
+    assert recommendations._recommendation_cache.get(key) is None